@@ -8,7 +8,8 @@ from utils.debug import print_r
 class AccessLevelController:
     
     @staticmethod
-    def index(filters=None, pagination=False, items_per_page=5, page=1, searchAll=None):
+    def index(filters=None, pagination=False, items_per_page=5, page=1, searchAll=None,
+              pagination_mode="offset", cursor=None, order_by=None):
         
         service = AccessLevelService()
 
@@ -17,7 +18,10 @@ class AccessLevelController:
             pagination=pagination,
             items_per_page=items_per_page,
             page=page,
-            search=searchAll
+            search=searchAll,
+            pagination_mode=pagination_mode,
+            cursor=cursor,
+            order_by=order_by,
         )
         
         return indexData
@@ -49,3 +53,23 @@ class AccessLevelController:
         service = AccessLevelService()   
         print("Controller Delete")
         return service.delete(id)
+
+    @staticmethod
+    def update_where(filters, data):
+        service = AccessLevelService()
+        return service.update_where(filters, data)
+
+    @staticmethod
+    def update_many(ids, data):
+        service = AccessLevelService()
+        return service.update_many(ids, data)
+
+    @staticmethod
+    def destroy_where(filters):
+        service = AccessLevelService()
+        return service.delete_where(filters)
+
+    @staticmethod
+    def destroy_many(ids):
+        service = AccessLevelService()
+        return service.delete_many(ids)
@@ -8,7 +8,8 @@ from services.SettingsService import SettingsService
 class SettingsController:
     
     @staticmethod
-    def index(filters=None, pagination=False, items_per_page=5, page=1, searchAll=None):
+    def index(filters=None, pagination=False, items_per_page=5, page=1, searchAll=None,
+              pagination_mode="offset", cursor=None, order_by=None):
         
         service = SettingsService()
 
@@ -17,7 +18,10 @@ class SettingsController:
             pagination=pagination,
             items_per_page=items_per_page,
             page=page,
-            search=searchAll
+            search=searchAll,
+            pagination_mode=pagination_mode,
+            cursor=cursor,
+            order_by=order_by,
         )
         
         return indexData
@@ -35,17 +39,37 @@ class SettingsController:
     @staticmethod
     def edit(id):
         service = SettingsService()     
-        result = service.get_user(id)
+        result = service.edit(id)
         return result
 
     @staticmethod
     def update(id, data):
         service = SettingsService()   
         print("Users Controller Update")
-        return service.update_user(id, data)
+        return service.update(id, data)
 
     @staticmethod
     def destroy(id):
         service = SettingsService()   
         print("Users Controller Delete")
         return service.delete_user(id)
+
+    @staticmethod
+    def update_where(filters, data):
+        service = SettingsService()
+        return service.update_where(filters, data)
+
+    @staticmethod
+    def update_many(ids, data):
+        service = SettingsService()
+        return service.update_many(ids, data)
+
+    @staticmethod
+    def destroy_where(filters):
+        service = SettingsService()
+        return service.delete_where(filters)
+
+    @staticmethod
+    def destroy_many(ids):
+        service = SettingsService()
+        return service.delete_many(ids)
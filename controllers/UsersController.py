@@ -8,7 +8,8 @@ from utils.debug import print_r
 class UsersController:
     
     @staticmethod
-    def index(filters=None, pagination=False, items_per_page=5, page=1, searchAll=None):
+    def index(filters=None, pagination=False, items_per_page=5, page=1, searchAll=None,
+              pagination_mode="offset", cursor=None, order_by=None):
         
         service = UsersService()
 
@@ -17,7 +18,10 @@ class UsersController:
             pagination=pagination,
             items_per_page=items_per_page,
             page=page,
-            search=searchAll
+            search=searchAll,
+            pagination_mode=pagination_mode,
+            cursor=cursor,
+            order_by=order_by,
         )
         
         return indexData
@@ -42,10 +46,30 @@ class UsersController:
     def update(id, data):
         service = UsersService()   
         print("Users Controller Update")
-        return service.update_user(id, data)
+        return service.update(id, data)
 
     @staticmethod
     def destroy(id):
         service = UsersService()   
         print("Users Controller Delete")
         return service.delete_user(id)
+
+    @staticmethod
+    def update_where(filters, data):
+        service = UsersService()
+        return service.update_where(filters, data)
+
+    @staticmethod
+    def update_many(ids, data):
+        service = UsersService()
+        return service.update_many(ids, data)
+
+    @staticmethod
+    def destroy_where(filters):
+        service = UsersService()
+        return service.delete_where(filters)
+
+    @staticmethod
+    def destroy_many(ids):
+        service = UsersService()
+        return service.delete_many(ids)
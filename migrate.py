@@ -3,6 +3,8 @@ import sqlite3
 import importlib.util
 import sys
 # python migrate.py --reset
+# python migrate.py --advise   (EXPLAIN QUERY PLAN report, no migrations run)
+# DB_PROFILE=performance python migrate.py   (PRAGMA profile, see ConnectionManager.PROFILES)
 
 BASE_DIR = os.path.dirname(__file__)
 DB_PATH = os.path.join(BASE_DIR, "data", "data.db")
@@ -57,15 +59,69 @@ def reset_database():
     else:
         print("Database file does not exist. Nothing to delete.")
 
+    # WAL sidecar files (performance profile)
+    for suffix in ("-wal", "-shm"):
+        if os.path.exists(DB_PATH + suffix):
+            os.remove(DB_PATH + suffix)
+            print(f"Deleted {DB_PATH + suffix}")
+
     log_db_state("  AFTER RESET  -> ")
     print()
 
 
+def advise_indexes():
+    """
+    Runs the statements the models generate for their common screens, then prints
+    their EXPLAIN QUERY PLAN: full scans, temp sorts and the indexes that would help.
+    """
+    sys.path.insert(0, os.path.abspath(BASE_DIR))
+    from models.user import User
+    from models.access_level import AccessLevel
+    from models.setting import Setting
+    from models.navigation import Navigation
+
+    # Representative workload (read-only) → fills each model's statement cache
+    User.index(pagination=True)
+    User.index(pagination=True, pagination_mode="keyset", sort_key="created_at")
+    User.index(filters={"created_at_from": "2000-01-01", "created_at_to": "2100-01-01"})
+    User.edit(1)
+    User.edit_sqlite(DB_PATH, User.table_name, User.fields, filters={"username": "admin"})
+    User.edit_sqlite(DB_PATH, User.table_name, User.fields, filters={"access_level": 1})
+    AccessLevel.index(pagination=True)
+    Setting.edit_sqlite(DB_PATH, Setting.table_name, Setting.fields, filters={"setting_name": "window_size"})
+    Navigation.index()
+    Navigation.edit_sqlite(DB_PATH, Navigation.table_name, Navigation.fields, filters={"parent_id": 1})
+
+    suggestions = []
+    for model in (User, AccessLevel, Setting, Navigation):
+        for report in model.advise_indexes(DB_PATH):
+            print(f"[{model.__name__}] {report['sql']}")
+            for detail in report["plan"]:
+                print(f"    {detail}")
+            for table, columns in report["suggested"]:
+                print(f"    -> suggest index on {table} ({', '.join(columns)})")
+                suggestions.append((table, columns))
+            print()
+
+    print("-" * 60)
+    if suggestions:
+        print("Suggested indexes (declare them in the model's `indexes`):")
+        for table, columns in dict.fromkeys(suggestions):
+            print(f"  {table} ({', '.join(columns)})")
+    else:
+        print("No missing indexes found.")
+
+
 def main():
     print("=" * 60)
     print("PYTHON SQLITE MIGRATION RUNNER")
     print("=" * 60)
 
+    if "--advise" in sys.argv:
+        print("INDEX ADVISOR MODE")
+        advise_indexes()
+        return
+
     if "--reset" in sys.argv:
         print("RESET MODE ENABLED")
         reset_database()
@@ -1,12 +1,16 @@
 # migrations/000_init_db.py
 
-import sqlite3
 import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.connection_manager import ConnectionManager
 
 DB_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "data.db")
 
 def migrate():
-    conn = sqlite3.connect(DB_PATH)
+    conn = ConnectionManager.connect(DB_PATH)
     cursor = conn.cursor()
 
     # USERS
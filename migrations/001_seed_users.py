@@ -1,13 +1,17 @@
 # migrations/001_seed_users.py
 
-import sqlite3
 import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.connection_manager import ConnectionManager
 
 DB_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "data.db")
 
 
 def migrate():
-    conn = sqlite3.connect(DB_PATH)
+    conn = ConnectionManager.connect(DB_PATH)
     cursor = conn.cursor()
 
     users = [
@@ -253,15 +257,15 @@ def migrate():
         },
     ]
 
-    for user in users:
-        cursor.execute(
-            """
-            INSERT INTO users (
-                customId, username, password, email, access_level,
-                account_status, is_locked, temporary_password,
-                created_at, updated_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+    cursor.executemany(
+        """
+        INSERT INTO users (
+            customId, username, password, email, access_level,
+            account_status, is_locked, temporary_password,
+            created_at, updated_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        (
             (
                 user["customId"],
                 user["username"],
@@ -273,8 +277,10 @@ def migrate():
                 user["temporary_password"],
                 user["created_at"],
                 user["updated_at"],
-            ),
-        )
+            )
+            for user in users
+        ),
+    )
 
     conn.commit()
     conn.close()
@@ -1,12 +1,16 @@
 # migrations/002_seed_settings.py
 
-import sqlite3
 import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.connection_manager import ConnectionManager
 
 DB_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "data.db")
 
 def migrate():
-    conn = sqlite3.connect(DB_PATH)
+    conn = ConnectionManager.connect(DB_PATH)
     cursor = conn.cursor()
 
     settings_data = [
@@ -22,6 +26,12 @@ def migrate():
             "setting_value": "1024x768",
             "setting_options": "800x600, 1024x768, 1280x800, 1366x768, 1920x1080",
         },
+        {
+            "id": 3,
+            "setting_name": "db_profile",
+            "setting_value": "default",
+            "setting_options": "default, performance",
+        },
     ]
 
     for setting in settings_data:
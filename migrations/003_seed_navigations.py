@@ -1,13 +1,17 @@
 # migrations/003_seed_navigations.py
 
-import sqlite3
 import os
+import sys
 import json
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.connection_manager import ConnectionManager
+
 DB_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "data.db")
 
 def migrate():
-    conn = sqlite3.connect(DB_PATH)
+    conn = ConnectionManager.connect(DB_PATH)
     cursor = conn.cursor()
 
     navigations = [
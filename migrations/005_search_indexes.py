@@ -0,0 +1,25 @@
+# migrations/005_search_indexes.py
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from models.user import User
+from models.access_level import AccessLevel
+from models.setting import Setting
+
+DB_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "data.db")
+
+
+def migrate():
+    # FTS5 tables + sync triggers for every field flagged "searchable"
+    for model in (User, AccessLevel, Setting):
+        if model.create_search_index(DB_PATH):
+            print(f"  search index ready: {model.get_search_table()}")
+
+    print("Migration 005_search_indexes complete.")
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,25 @@
+# migrations/006_trigram_indexes.py
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from models.user import User
+from models.access_level import AccessLevel
+from models.setting import Setting
+
+DB_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "data.db")
+
+
+def migrate():
+    # Trigram FTS5 tables for fields flagged "trigram" (infix column filters)
+    for model in (User, AccessLevel, Setting):
+        if model.create_trigram_index(DB_PATH):
+            print(f"  trigram index ready: {model.get_trigram_table()}")
+
+    print("Migration 006_trigram_indexes complete.")
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,26 @@
+# migrations/007_indexes.py
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from models.user import User
+from models.access_level import AccessLevel
+from models.setting import Setting
+from models.navigation import Navigation
+
+DB_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "data.db")
+
+
+def migrate():
+    # Secondary indexes declared in each model's `indexes`
+    for model in (User, AccessLevel, Setting, Navigation):
+        for name in model.create_indexes(DB_PATH):
+            print(f"  index ready: {name}")
+
+    print("Migration 007_indexes complete.")
+
+
+if __name__ == "__main__":
+    migrate()
@@ -2,6 +2,7 @@
 import os
 from datetime import datetime
 from models.base_model import BaseModel
+from models.relations import has_many
 from utils.debug import print_r
 DB_PATH = os.path.join(
     os.path.dirname(os.path.abspath(__file__)), "..", "data", "data.db"
@@ -10,6 +11,7 @@ DB_PATH = os.path.join(
 
 class AccessLevel(BaseModel):
     table_name = "access_levels"
+    db_path = DB_PATH
     fields = ["id", "access_level_name", "access_level_code"]
 
     field_definitions = {
@@ -19,12 +21,14 @@ class AccessLevel(BaseModel):
             "is_hidden": False,
             "order": 2,
             "editable": True,
+            "searchable": True,
         },
         "access_level_code": {
             "alias": "Access Level Code",
             "is_hidden": False,
             "order": 2,
             "editable": True,
+            "searchable": True,
         },
 
     }
@@ -36,10 +40,10 @@ class AccessLevel(BaseModel):
         "access_level_code",
     ]
 
-    def __init__(self, **kwargs):
-        for field in self.fields:
-            setattr(self, field, kwargs.get(field))
-
+    # Users holding this level (AccessLevel.load_relations(levels, "users"))
+    relations = {
+        "users": has_many("models.user.User", "access_level"),
+    }
 
     @classmethod
     def index(
@@ -53,6 +57,10 @@ class AccessLevel(BaseModel):
         custom_fields=None,      # optional, matches SELECT columns
         table_alias=None,        # optional alias for table in query
         debug=False,
+        pagination_mode="offset",  # "offset" or "keyset"
+        cursor=None,             # keyset cursor from a previous page
+        sort_key=None,           # keyset sort column
+        order_by=None,           # "-created_at,access_level_name" style sort
     ):
         """
         Generic index method.
@@ -84,6 +92,10 @@ class AccessLevel(BaseModel):
             custom_fields=custom_fields,
             table_alias=table_alias,
             debug=debug,
+            pagination_mode=pagination_mode,
+            cursor=cursor,
+            sort_key=sort_key,
+            order_by=order_by,
         )
 
     @classmethod
@@ -155,11 +167,11 @@ class AccessLevel(BaseModel):
 
     @classmethod
     def get_dynamic_field_definitions(cls):
-        """Injects access_level options dynamically based on AccessLevel.index()"""
+        """Injects access_level options dynamically based on AccessLevel.index_iter()"""
         field_defs = dict(cls.field_definitions)
 
         try:
-            access_levels = AccessLevel.index()
+            access_levels = AccessLevel.index_iter()
             field_defs["access_level_name"]["options"] = [
                 {"label": al.access_level_name, "value": al.id} for al in access_levels
             ]
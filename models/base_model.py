@@ -1,11 +1,1056 @@
+import asyncio
+import base64
+import json
+import os
+import re
 import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
 from datetime import datetime
+from itertools import islice
 from pprint import pprint
 from utils.debug import print_r
+from utils.connection_manager import ConnectionManager
+from utils.query_cache import QueryCache
+from utils.query_monitor import QueryMonitor
+from models.result_set import ResultSet
+from models.model_meta import ModelMeta, AttributeView
+from models.relations import resolve_model
 
-class BaseModel:
+DB_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "data", "data.db"
+)
+
+
+class BaseModel(metaclass=ModelMeta):
     # Add your JSON helpers here if needed...
 
+    # Instances are __slots__ objects built from `fields` + `extra_fields`
+    # (see ModelMeta); extra_fields are joined / computed columns.
+    # _original holds the (fields, row) an instance was loaded from.
+    __slots__ = ("_original",)
+    extra_fields = []
+
+    @property
+    def __dict__(self):
+        """Write-through dict view of the slots (code written for plain objects keeps working)."""
+        return AttributeView(self)
+
+    # Default database for BaseModel-level helpers (models pass their own path)
+    db_path = DB_PATH
+
+    # Default sort column for keyset (cursor) pagination
+    keyset_key = "id"
+
+    # ORDER BY applied when index() gets no order_by ("-column" = descending);
+    # None → rows in whatever order SQLite returns them, which leaves the planner
+    # free to drive the query from a filter's index. Skipped for projections
+    # that don't select its columns. Paginated queries always get at least
+    # ORDER BY id so pages don't overlap.
+    default_order_by = None
+
+    # How paginated queries get their total:
+    #   "window"   → COUNT(*) OVER() on the page query itself (one statement)
+    #   "separate" → SELECT COUNT(*) FROM (...) before the page query
+    count_mode = "window"
+
+    # Run a paginated page + COUNT in one read transaction (BEGIN DEFERRED), so a
+    # concurrent write can't land between them; see also snapshot()
+    consistent_reads = True
+
+    # Totals cached per filter signature; any write to a table invalidates them
+    count_cache_size = 256
+
+    _table_versions = {}
+    _count_cache = OrderedDict()
+    _cache_lock = threading.RLock()
+
+    # (db, FTS table) → exists?, so search doesn't probe sqlite_master every keystroke
+    _search_index_exists = {}
+
+    # Related models: {"name": belongs_to(...) | has_many(...)} (models/relations.py).
+    # Loaded in batches by index_sqlite / edit_sqlite / iter_sqlite(include=[...])
+    relations = {}
+    default_include = []            # relations the model's own index / edit wrappers load
+    relation_chunk = 500            # keys per "WHERE key IN (...)" query
+    _relation_local = threading.local()   # per-request related-row cache (relation_scope)
+    _transaction_local = threading.local()  # open transaction() per database, per thread
+
+    # Secondary indexes applied by create_indexes() (migration 007):
+    #   "column" or ("column1", "column2") for a composite index
+    indexes = []
+
+    # Bounded worker pool behind the async API (aindex / aedit / astore / ...)
+    async_workers = 4
+    _executor = None
+
+    # Compiled SQL per query shape (model, filter keys, search, pagination mode)
+    statement_cache_size = 512
+    _statement_cache = OrderedDict()
+    _statement_stats = {"hits": 0, "misses": 0}
+    # First parameters each SQL text ran with (explain_query / advise_indexes plan
+    # with real values: NULL-bound LIKE 'ab%' never uses its index)
+    _sample_params = {}
+
+    # index_sqlite() results (raw rows + totals), dropped on writes to any table read
+    result_cache_enabled = True
+    _result_cache = QueryCache(max_entries=256, max_bytes=8 * 1024 * 1024)
+
+    # Rows by primary key (identity map over a bounded LRU): filled by index_sqlite /
+    # edit_sqlite, read by edit_sqlite(id), dropped on writes to the row's table
+    row_cache_enabled = True
+    _row_cache = QueryCache(max_entries=2048, max_bytes=4 * 1024 * 1024)
+
+    # -----------------------
+    # Connections
+    # -----------------------
+    @classmethod
+    def get_connection(cls, db_path=None):
+        """
+        Borrow a pooled connection for db_path (defaults to cls.db_path).
+
+        Usage:
+            with User.get_connection(DB_PATH) as conn:
+                conn.execute(...)
+        """
+        db_path = db_path or cls.db_path
+        if getattr(BaseModel._transaction_local, "states", None):
+            state = BaseModel._transaction_local.states.get(os.path.abspath(db_path))
+            if state is not None:
+                return nullcontext(state["conn"])  # inside transaction(): share its connection
+        return ConnectionManager.get(db_path).connection()
+
+    @classmethod
+    def connection_stats(cls, db_path=None):
+        """Pool counters (opens, reuses, latency saved) for db_path."""
+        return ConnectionManager.get(db_path or cls.db_path).stats()
+
+    @classmethod
+    def close_connections(cls):
+        """Close every pooled connection (call on application shutdown)."""
+        cls.shutdown_async()
+        ConnectionManager.close_all()
+
+    # -----------------------
+    # Unit of work (grouped writes)
+    # -----------------------
+    @classmethod
+    @contextmanager
+    def transaction(cls, db_path=None):
+        """
+        Every model read / write on db_path in this thread runs on one connection
+        and is committed once when the block ends (rolled back if it raises).
+        Nested blocks become savepoints: an inner failure only undoes the inner
+        writes. Reads in the block bypass the shared result / count / row caches,
+        and written tables are invalidated again once the outcome is final.
+
+        Usage:
+            with BaseModel.transaction(DB_PATH):
+                level = AccessLevel.store_sqlite(DB_PATH, "access_levels", access_level_name="Guest")
+                User.update_where({"access_level__eq": 3}, access_level=level.id)
+
+        Async calls (aindex, ...) run on worker threads, outside the transaction.
+        """
+        db_path = db_path or cls.db_path
+        key = os.path.abspath(db_path)
+        states = cls._transaction_states()
+        state = states.get(key)
+
+        if state is not None:
+            state["depth"] += 1
+            savepoint = f"uow_{state['depth']}"
+            conn = state["conn"]
+            conn.execute(f"SAVEPOINT {savepoint}")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute(f"ROLLBACK TO {savepoint}")
+                conn.execute(f"RELEASE {savepoint}")
+                raise
+            else:
+                conn.execute(f"RELEASE {savepoint}")
+            finally:
+                state["depth"] -= 1
+            return
+
+        manager = ConnectionManager.get(db_path)
+        conn = manager.acquire()
+        state = states[key] = {"conn": conn, "depth": 0, "tables": set()}
+        discard = False
+        try:
+            # IMMEDIATE takes the write lock up front (no deadlock upgrading a read)
+            conn.execute("BEGIN IMMEDIATE")
+            yield conn
+            conn.commit()
+        except BaseException:
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                discard = True
+            raise
+        finally:
+            del states[key]
+            manager.release(conn, discard=discard)
+            for table_name in state["tables"]:
+                cls.bump_table_version(db_path, table_name)
+
+    @classmethod
+    @contextmanager
+    def snapshot(cls, db_path=None):
+        """
+        Every read on db_path in this thread sees the database at one point in
+        time until the block ends: one BEGIN DEFERRED read transaction on a
+        shared connection. For screens built from several queries, e.g. a dashboard:
+
+            with BaseModel.snapshot(DB_PATH):
+                users = User.index(pagination=True)
+                levels = AccessLevel.index()
+
+        Result / count / row caches are bypassed inside the block (they may hold
+        newer rows than the snapshot). Writes are refused; use transaction().
+        Inside an open transaction() the block simply reuses it.
+
+        Writers on other connections keep committing only under WAL (the
+        "performance" profile). With the default rollback journal the snapshot
+        holds a SHARED lock from its first read, so their commits wait (up to the
+        busy timeout, then "database is locked") until the block ends: keep it short.
+        """
+        db_path = db_path or cls.db_path
+        key = os.path.abspath(db_path)
+        states = cls._transaction_states()
+        if key in states:
+            yield states[key]["conn"]
+            return
+
+        manager = ConnectionManager.get(db_path)
+        conn = manager.acquire()
+        states[key] = {"conn": conn, "depth": 0, "tables": set(), "read_only": True}
+        discard = False
+        try:
+            conn.execute("BEGIN DEFERRED")
+            yield conn
+        finally:
+            del states[key]
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                discard = True
+            manager.release(conn, discard=discard)
+
+    @staticmethod
+    @contextmanager
+    def _read_transaction(conn):
+        """Several reads on conn as one snapshot (no-op when conn is already in a transaction)."""
+        if conn.in_transaction:
+            yield conn
+            return
+        conn.execute("BEGIN DEFERRED")
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+
+    @classmethod
+    def _shared_caches(cls, db_path):
+        """
+        False inside transaction() / snapshot() on db_path: a transaction sees its own
+        uncommitted rows (other threads must never be served them) and a snapshot
+        may be older than what the caches hold.
+        """
+        states = getattr(BaseModel._transaction_local, "states", None)
+        return not states or os.path.abspath(db_path) not in states
+
+    @classmethod
+    def in_transaction(cls, db_path=None):
+        """True inside transaction() for db_path on the calling thread."""
+        return os.path.abspath(db_path or cls.db_path) in cls._transaction_states()
+
+    @staticmethod
+    def _transaction_states():
+        states = getattr(BaseModel._transaction_local, "states", None)
+        if states is None:
+            states = BaseModel._transaction_local.states = {}
+        return states
+
+    @staticmethod
+    def _commit(conn):
+        """conn.commit(), left to transaction() when conn belongs to an open one."""
+        states = getattr(BaseModel._transaction_local, "states", None)
+        for state in (states or {}).values():
+            if state["conn"] is conn:
+                if state.get("read_only"):
+                    raise sqlite3.OperationalError("Writes are not allowed inside snapshot(); use transaction()")
+                return
+        conn.commit()
+
+    @staticmethod
+    def _execute(conn, sql, params=(), fetch=None, many=False):
+        """
+        Runs one statement under QueryMonitor (timing hooks + slow-query log).
+
+        fetch: "all" → list of rows, "one" → row or None, None → the cursor
+        many:  executemany() over params (a list of row tuples)
+        """
+        sample = params[0] if many and params else params
+        if sql not in BaseModel._sample_params and len(BaseModel._sample_params) < BaseModel.statement_cache_size:
+            BaseModel._sample_params[sql] = sample if isinstance(sample, dict) else tuple(sample or ())
+
+        with QueryMonitor.track(sql, sample) as event:
+            if many:
+                db_cursor = conn.executemany(sql, params)
+                event["rows"] = db_cursor.rowcount
+                return db_cursor
+
+            db_cursor = conn.execute(sql, params)
+            if fetch == "all":
+                rows = db_cursor.fetchall()
+                event["rows"] = len(rows)
+                return rows
+            if fetch == "one":
+                row = db_cursor.fetchone()
+                event["rows"] = 0 if row is None else 1
+                return row
+            event["rows"] = db_cursor.rowcount
+            return db_cursor
+
+    # -----------------------
+    # Async API
+    # -----------------------
+    @classmethod
+    def _get_executor(cls):
+        # Worker threads are pinned → each keeps one dedicated connection per database
+        with cls._cache_lock:
+            if BaseModel._executor is None:
+                BaseModel._executor = ThreadPoolExecutor(
+                    max_workers=BaseModel.async_workers,
+                    thread_name_prefix="db-worker",
+                    initializer=ConnectionManager.pin_thread,
+                )
+            return BaseModel._executor
+
+    @classmethod
+    async def run_async(cls, func, *args, **kwargs):
+        """
+        Runs the blocking func(*args, **kwargs) on the bounded db worker pool.
+
+        Usage:
+            users, levels = await asyncio.gather(User.aindex(), AccessLevel.aindex())
+        """
+        controller = QueryMonitor.caller()
+
+        def call():
+            with QueryMonitor.bind_controller(controller):
+                return func(*args, **kwargs)
+
+        return await asyncio.get_running_loop().run_in_executor(cls._get_executor(), call)
+
+    @classmethod
+    def shutdown_async(cls, wait=True):
+        """Stops the worker pool (recreated on the next async call)."""
+        with cls._cache_lock:
+            executor, BaseModel._executor = BaseModel._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    @classmethod
+    async def aindex(cls, *args, **kwargs):
+        return await cls.run_async(cls.index, *args, **kwargs)
+
+    @classmethod
+    async def aedit(cls, *args, **kwargs):
+        return await cls.run_async(cls.edit, *args, **kwargs)
+
+    @classmethod
+    async def astore(cls, *args, **kwargs):
+        return await cls.run_async(cls.store, *args, **kwargs)
+
+    @classmethod
+    async def aupdate(cls, *args, **kwargs):
+        return await cls.run_async(cls.update, *args, **kwargs)
+
+    @classmethod
+    async def adestroy(cls, *args, **kwargs):
+        return await cls.run_async(cls.destroy, *args, **kwargs)
+
+    # -----------------------
+    # Table versions (write invalidation)
+    # -----------------------
+    @staticmethod
+    def _table_key(db_path, table_name):
+        return (os.path.abspath(db_path), table_name)
+
+    @classmethod
+    def get_table_version(cls, db_path, table_name):
+        with cls._cache_lock:
+            return BaseModel._table_versions.get(cls._table_key(db_path, table_name), 0)
+
+    @classmethod
+    def bump_table_version(cls, db_path, table_name):
+        """Marks table_name as written; cached counts and results that read it become stale."""
+        with cls._cache_lock:
+            key = cls._table_key(db_path, table_name)
+            BaseModel._table_versions[key] = BaseModel._table_versions.get(key, 0) + 1
+        BaseModel._result_cache.invalidate(key)
+        BaseModel._row_cache.invalidate(key)
+
+        states = getattr(BaseModel._transaction_local, "states", None)
+        if states and key[0] in states:
+            # Other threads may cache the pre-commit rows under the new version → bump again at the end
+            states[key[0]]["tables"].add(table_name)
+
+        scope = getattr(BaseModel._relation_local, "cache", None)
+        if scope:
+            for slot in [slot for slot in scope if slot[0] == key]:
+                del scope[slot]
+
+    _SQL_TOKEN = re.compile(r"'(?:[^']|'')*'|\"[^\"]*\"|`[^`]*`|\[[^\]]*\]|[A-Za-z_][\w$]*|\S")
+    _FROM_LIST_END = {"WHERE", "GROUP", "HAVING", "ORDER", "LIMIT", "WINDOW", "UNION", "EXCEPT", "INTERSECT"}
+
+    @classmethod
+    def _query_tables(cls, table_name, query):
+        """
+        Main table plus every table query reads: FROM / JOIN targets, comma joins
+        and tables inside subqueries. None when that can't be told from the SQL
+        (CTEs, table-valued functions); such queries are never result-cached.
+        """
+        tokens = cls._SQL_TOKEN.findall(query or "")
+        if tokens and tokens[0].upper() == "WITH":
+            return None
+
+        tables = {table_name}
+        in_from = [False]        # per parenthesis depth: inside a FROM list
+        expect_table = False
+        index = 0
+        while index < len(tokens):
+            token = tokens[index]
+            upper = token.upper()
+            index += 1
+
+            if token == "(":
+                in_from.append(False)
+                expect_table = False  # subquery / grouped join: scanned on its own
+            elif token == ")":
+                if len(in_from) > 1:
+                    in_from.pop()
+            elif expect_table:
+                expect_table = False
+                following = tokens[index:index + 2]
+                if following[:1] == ["("]:
+                    return None  # table-valued function
+                if following[:1] == ["."]:
+                    token = following[1] if len(following) == 2 else token  # schema.table
+                    index += 2
+                tables.add(token.strip('"`[]'))
+            elif upper in ("FROM", "JOIN"):
+                in_from[-1] = expect_table = True
+            elif token == "," and in_from[-1]:
+                expect_table = True
+            elif upper in cls._FROM_LIST_END:
+                in_from[-1] = False
+        return tuple(sorted(tables))
+
+    # -----------------------
+    # Relations (batched loading)
+    # -----------------------
+    @classmethod
+    def get_relation_fields(cls):
+        """Mapped belongs_to fields: {"access_level_name": (related model, foreign key, related column)}"""
+        return {
+            field: (resolve_model(spec), spec["foreign_key"], column)
+            for spec in cls.relations.values()
+            for field, column in spec["fields"].items()
+        }
+
+    @classmethod
+    def _unselected_relation_fields(cls, selected):
+        """Relation fields the query doesn't select itself → answered by subqueries."""
+        if not cls.relations:
+            return {}
+        return {field: target for field, target in cls.get_relation_fields().items() if field not in selected}
+
+    @staticmethod
+    @contextmanager
+    def relation_scope():
+        """
+        Per-request cache of related rows: inside the block each related row is
+        fetched at most once, however many pages / objects ask for it. Nested
+        scopes share the outer one; writes drop the written table's entries.
+
+            with User.relation_scope():
+                users = User.index()
+                admin = User.edit(1)      # access level already loaded → no query
+        """
+        local = BaseModel._relation_local
+        if getattr(local, "cache", None) is not None:
+            yield local.cache
+            return
+        local.cache = {}
+        try:
+            yield local.cache
+        finally:
+            local.cache = None
+
+    @classmethod
+    def load_relations(cls, rows, include, db_path=None):
+        """
+        Loads the named relations for rows (a ResultSet or a list of objects) with
+        one "WHERE key IN (...)" query per relation, whatever the number of rows:
+            belongs_to → the related object (+ its mapped fields, e.g. access_level_name)
+            has_many   → list of related objects
+        Returns rows.
+        """
+        db_path = db_path or cls.db_path
+        for name in [include] if isinstance(include, str) else include:
+            spec = cls.relations.get(name)
+            if spec is None:
+                raise ValueError(f"{cls.__name__} has no relation '{name}'")
+            related = resolve_model(spec)
+
+            if spec["type"] == "belongs_to":
+                keys = cls._relation_keys(rows, spec["foreign_key"])
+                found = related._fetch_related(db_path, "id", keys)
+                objects = [found.get(key) for key in keys]
+                cls._attach(rows, name, objects)
+                for field, column in spec["fields"].items():
+                    cls._attach(rows, field, [None if obj is None else getattr(obj, column) for obj in objects])
+            else:
+                ids = cls._relation_keys(rows, "id")
+                found = related._fetch_related(db_path, spec["foreign_key"], ids, many=True)
+                cls._attach(rows, name, [list(found.get(row_id, ())) for row_id in ids])
+        return rows
+
+    @classmethod
+    def _fetch_related(cls, db_path, key_column, keys, many=False):
+        """{key: object} (or {key: [objects]} when many) for rows whose key_column is in keys."""
+        pending = list(dict.fromkeys(key for key in keys if key is not None))
+        found = {}
+
+        scope = getattr(BaseModel._relation_local, "cache", None)
+        slot = None
+        if scope is not None:
+            slot = scope.setdefault((cls._table_key(db_path, cls.table_name), key_column), {})
+            found = {key: slot[key] for key in pending if key in slot}
+            pending = [key for key in pending if key not in slot]
+
+        if not many and key_column == "id" and BaseModel.row_cache_enabled and cls._shared_caches(db_path):
+            # belongs_to targets by primary key → rows already seen come from the row cache
+            missing = []
+            for key in pending:
+                row = cls._cached_row(db_path, cls.table_name, key, cls.fields)
+                if row is None:
+                    missing.append(key)
+                else:
+                    found[key] = cls.from_row(row, cls.fields)
+                    if slot is not None:
+                        slot[key] = found[key]
+            pending = missing
+
+        for start in range(0, len(pending), cls.relation_chunk):
+            chunk = pending[start:start + cls.relation_chunk]
+            related_rows = cls.index_sqlite(
+                db_path, cls.table_name, cls.fields,
+                filters={f"{key_column}__in": chunk},
+                order_by=None if many else "",
+            )
+            fetched = {key: [] for key in chunk} if many else dict.fromkeys(chunk)
+            for obj in related_rows:
+                if many:
+                    fetched.setdefault(getattr(obj, key_column), []).append(obj)
+                else:
+                    fetched[getattr(obj, key_column)] = obj
+            found.update(fetched)
+            if slot is not None:
+                slot.update(fetched)
+        return found
+
+    @staticmethod
+    def _relation_keys(rows, column):
+        if isinstance(rows, ResultSet):
+            return rows.column(column)
+        return [getattr(row, column, None) for row in rows]
+
+    @staticmethod
+    def _attach(rows, name, values):
+        if isinstance(rows, ResultSet):
+            rows.add_column(name, values)
+        else:
+            for row, value in zip(rows, values):
+                setattr(row, name, value)
+
+    # -----------------------
+    # Count cache
+    # -----------------------
+    @classmethod
+    def _count_signature(cls, db_path, tables, count_query, params):
+        versions = tuple(cls.get_table_version(db_path, table) for table in tables)
+        return (os.path.abspath(db_path), count_query, tuple(params)), versions
+
+    @classmethod
+    def _get_cached_count(cls, signature):
+        key, versions = signature
+        with cls._cache_lock:
+            entry = BaseModel._count_cache.get(key)
+            if entry is None:
+                return None
+            if entry[0] != versions:
+                del BaseModel._count_cache[key]
+                return None
+            BaseModel._count_cache.move_to_end(key)
+            return entry[1]
+
+    @classmethod
+    def _set_cached_count(cls, signature, total):
+        key, versions = signature
+        with cls._cache_lock:
+            BaseModel._count_cache[key] = (versions, total)
+            BaseModel._count_cache.move_to_end(key)
+            while len(BaseModel._count_cache) > cls.count_cache_size:
+                BaseModel._count_cache.popitem(last=False)
+
+    @classmethod
+    def clear_count_cache(cls):
+        with cls._cache_lock:
+            BaseModel._count_cache.clear()
+
+    # -----------------------
+    # Result cache
+    # -----------------------
+    @classmethod
+    def configure_result_cache(cls, enabled=None, max_entries=None, max_bytes=None):
+        """Turns the result cache on/off and changes its limits."""
+        if enabled is not None:
+            BaseModel.result_cache_enabled = enabled
+            if not enabled:
+                BaseModel._result_cache.clear()
+        if max_entries is not None:
+            BaseModel._result_cache.max_entries = max_entries
+        if max_bytes is not None:
+            BaseModel._result_cache.max_bytes = max_bytes
+
+    @staticmethod
+    def result_cache_stats():
+        """hits / misses / hit_ratio / entries / bytes / evictions / invalidations"""
+        return BaseModel._result_cache.stats()
+
+    @staticmethod
+    def clear_result_cache():
+        BaseModel._result_cache.clear()
+
+    # -----------------------
+    # Row cache (identity map)
+    # -----------------------
+    @classmethod
+    def configure_row_cache(cls, enabled=None, max_entries=None, max_bytes=None):
+        """Turns the primary-key row cache on/off and changes its limits."""
+        if enabled is not None:
+            BaseModel.row_cache_enabled = enabled
+            if not enabled:
+                BaseModel._row_cache.clear()
+        if max_entries is not None:
+            BaseModel._row_cache.max_entries = max_entries
+        if max_bytes is not None:
+            BaseModel._row_cache.max_bytes = max_bytes
+
+    @staticmethod
+    def row_cache_stats():
+        """hits / misses / hit_ratio / entries / bytes / evictions / invalidations"""
+        return BaseModel._row_cache.stats()
+
+    @staticmethod
+    def clear_row_cache():
+        BaseModel._row_cache.clear()
+
+    @staticmethod
+    def _row_cache_key(db_path, table_name, row_id):
+        if isinstance(row_id, str) and row_id.isdigit():
+            row_id = int(row_id)  # ids from form fields / Treeview values
+        return os.path.abspath(db_path), table_name, row_id
+
+    @staticmethod
+    def _is_plain_select(table_name, fields, base_query):
+        """True for "SELECT <fields> FROM table" (no joins / aliases) → rows map 1:1 to table rows."""
+        return " ".join(base_query.split()) == f"SELECT {', '.join(fields)} FROM {table_name}"
+
+    @classmethod
+    def _remember_rows(cls, db_path, table_name, final_fields, rows, version):
+        """Puts table rows (as read at table version) into the row cache, keyed by id."""
+        if "id" not in final_fields:
+            return
+        id_index = final_fields.index("id")
+        field_key = tuple(final_fields)
+        table_key = [cls._table_key(db_path, table_name)]
+        cache = BaseModel._row_cache
+        # Only the newest rows would survive a larger batch anyway
+        for row in rows[-cache.max_entries:]:
+            cache.set(cls._row_cache_key(db_path, table_name, row[id_index]), (field_key, row),
+                      table_key, (version,), size=sys.getsizeof(row) + 64 * len(row))
+
+    @classmethod
+    def _cached_row(cls, db_path, table_name, row_id, final_fields):
+        """Cached row for row_id projected onto final_fields, or None."""
+        version = cls.get_table_version(db_path, table_name)
+        entry = BaseModel._row_cache.get(cls._row_cache_key(db_path, table_name, row_id), (version,))
+        if entry is None:
+            return None
+        cached_fields, row = entry
+        if tuple(final_fields) == cached_fields:
+            return row
+        if not all(field in cached_fields for field in final_fields):
+            return None
+        return tuple(row[cached_fields.index(field)] for field in final_fields)
+
+    @staticmethod
+    def _with_window_count(query):
+        """
+        Adds COUNT(*) OVER () as the first selected column, or returns None when the
+        query shape (DISTINCT / GROUP BY / compound) would make the window count wrong.
+        """
+        if re.search(r"\b(DISTINCT|GROUP\s+BY|UNION|INTERSECT|EXCEPT)\b", query, re.IGNORECASE):
+            return None
+        match = re.match(r"\s*SELECT\s", query, re.IGNORECASE)
+        if not match:
+            return None
+        return f"SELECT COUNT(*) OVER () AS __total_rows, {query[match.end():]}"
+
+    # -----------------------
+    # Full-text search index (FTS5)
+    # -----------------------
+    @classmethod
+    def get_search_fields(cls):
+        """
+        DB columns flagged {"searchable": True} in field_definitions.
+        These feed the model's FTS5 table used by index_sqlite(search=...).
+        """
+        field_defs = getattr(cls, "field_definitions", {})
+        if not isinstance(field_defs, dict):
+            return []
+        return [
+            key for key, val in field_defs.items()
+            if isinstance(val, dict) and val.get("searchable") and key in getattr(cls, "fields", [])
+        ]
+
+    @classmethod
+    def get_search_table(cls, table_name=None):
+        return f"{table_name or cls.table_name}_fts"
+
+    @classmethod
+    def create_search_index(cls, db_path=None):
+        """
+        Creates the external-content FTS5 table for the searchable fields, the
+        insert/update/delete triggers that keep it in sync, and (re)builds it
+        from the existing rows. Safe to run repeatedly (used by migrations).
+
+        Returns:
+            True if an index was created, False if the model has no searchable fields
+        """
+        return cls._create_fts_index(
+            db_path or cls.db_path, cls.get_search_table(), cls.get_search_fields()
+        )
+
+    @classmethod
+    def _create_fts_index(cls, db_path, fts, index_fields, tokenize=None):
+        if not index_fields:
+            return False
+
+        table = cls.table_name
+        columns = ", ".join(f'"{field}"' for field in index_fields)
+        new_values = ", ".join(f'new."{field}"' for field in index_fields)
+        old_values = ", ".join(f'old."{field}"' for field in index_fields)
+        options = f", tokenize='{tokenize}'" if tokenize else ""
+
+        with cls.get_connection(db_path) as conn:
+            conn.executescript(f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS {fts}
+                    USING fts5({columns}, content='{table}', content_rowid='id'{options});
+
+                CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN
+                    INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new_values});
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+                    INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {columns} ON {table} BEGIN
+                    INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+                    INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new_values});
+                END;
+
+                INSERT INTO {fts}({fts}) VALUES ('rebuild');
+            """)
+            cls._commit(conn)
+
+        with cls._cache_lock:
+            BaseModel._search_index_exists[cls._table_key(db_path, fts)] = True
+        return True
+
+    @classmethod
+    def _fts_table_exists(cls, db_path, fts):
+        key = cls._table_key(db_path, fts)
+        with cls._cache_lock:
+            exists = BaseModel._search_index_exists.get(key)
+
+        if exists is None:
+            with cls.get_connection(db_path) as conn:
+                exists = conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts,)
+                ).fetchone() is not None
+            with cls._cache_lock:
+                BaseModel._search_index_exists[key] = exists
+        return exists
+
+    @classmethod
+    def _get_search_index(cls, db_path, table_name):
+        """FTS table name to search through, or None (not declared / not migrated yet)."""
+        if not cls.get_search_fields():
+            return None
+        fts = cls.get_search_table(table_name)
+        return fts if cls._fts_table_exists(db_path, fts) else None
+
+    @staticmethod
+    def _search_match_query(search):
+        """
+        "jean admin@" → '"jean"* "admin"*' (every word, prefix match, AND-ed).
+        Returns None when the term has no indexable words.
+        """
+        words = re.findall(r"\w+", search.lower())
+        if not words:
+            return None
+        return " ".join(f'"{word}"*' for word in words)
+
+    # -----------------------
+    # Trigram substring index (per-column filters)
+    # -----------------------
+    @classmethod
+    def get_trigram_fields(cls):
+        """DB columns flagged {"trigram": True} in field_definitions."""
+        field_defs = getattr(cls, "field_definitions", {})
+        if not isinstance(field_defs, dict):
+            return []
+        return [
+            key for key, val in field_defs.items()
+            if isinstance(val, dict) and val.get("trigram") and key in getattr(cls, "fields", [])
+        ]
+
+    @classmethod
+    def get_trigram_table(cls, table_name=None):
+        return f"{table_name or cls.table_name}_trgm"
+
+    @classmethod
+    def create_trigram_index(cls, db_path=None):
+        """
+        Creates an FTS5 trigram table over the flagged columns (plus sync triggers)
+        so "contains" filters (LIKE '%value%') are answered from the index.
+
+        Returns:
+            True if an index was created, False if no field is flagged
+        """
+        return cls._create_fts_index(
+            db_path or cls.db_path, cls.get_trigram_table(), cls.get_trigram_fields(), tokenize="trigram"
+        )
+
+    @classmethod
+    def _get_trigram_index(cls, db_path, table_name):
+        """{column: trigram table} for the flagged columns, or {} when not migrated yet."""
+        trigram_fields = cls.get_trigram_fields()
+        if not trigram_fields:
+            return {}
+        trgm = cls.get_trigram_table(table_name)
+        if not cls._fts_table_exists(db_path, trgm):
+            return {}
+        return {field: trgm for field in trigram_fields}
+
+    # -----------------------
+    # Secondary indexes + query plan advisor
+    # -----------------------
+    @classmethod
+    def get_index_definitions(cls, table_name=None):
+        """[(index name, table, (columns...)), ...] from the declarative `indexes`"""
+        table_name = table_name or cls.table_name
+        definitions = []
+        for entry in cls.indexes:
+            columns = (entry,) if isinstance(entry, str) else tuple(entry)
+            definitions.append((f"idx_{table_name}_{'_'.join(columns)}", table_name, columns))
+        return definitions
+
+    @classmethod
+    def create_indexes(cls, db_path=None):
+        """CREATE INDEX IF NOT EXISTS for every declared index. Returns their names."""
+        definitions = cls.get_index_definitions()
+        if not definitions:
+            return []
+
+        with cls.get_connection(db_path) as conn:
+            for name, table, columns in definitions:
+                cols = ", ".join(f'"{col}"' for col in columns)
+                conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({cols})")
+            conn.execute(f"ANALYZE {cls.table_name}")
+            cls._commit(conn)
+        return [name for name, _, _ in definitions]
+
+    @classmethod
+    def get_case_insensitive_fields(cls):
+        """Real columns flagged "case_insensitive" in field_definitions."""
+        definitions = getattr(cls, "field_definitions", None) or {}
+        return [
+            field for field in cls.fields
+            if isinstance(definitions.get(field), dict) and definitions[field].get("case_insensitive")
+        ]
+
+    @classmethod
+    def create_nocase_indexes(cls, db_path=None):
+        """
+        COLLATE NOCASE index per case-insensitive column, so equality (= ? COLLATE NOCASE)
+        and prefix (LIKE 'abc%') filters become index lookups. Returns the index names.
+        """
+        columns = cls.get_case_insensitive_fields()
+        if not columns:
+            return []
+
+        names = []
+        with cls.get_connection(db_path) as conn:
+            for column in columns:
+                name = f"idx_{cls.table_name}_{column}_nocase"
+                conn.execute(
+                    f'CREATE INDEX IF NOT EXISTS {name} ON {cls.table_name} ("{column}" COLLATE NOCASE)'
+                )
+                names.append(name)
+            conn.execute(f"ANALYZE {cls.table_name}")
+            cls._commit(conn)
+        return names
+
+    @classmethod
+    def captured_statements(cls):
+        """SQL this model has compiled so far (index page/count + edit statements)."""
+        statements = []
+        with cls._cache_lock:
+            entries = list(BaseModel._statement_cache.items())
+        for key, statement in entries:
+            if key[1] is not cls:
+                continue
+            if isinstance(statement, dict):
+                statements.extend(sql for sql in (statement["page_sql"], statement["count_sql"]) if sql)
+            else:
+                statements.append(statement)
+        return list(dict.fromkeys(statements))
+
+    @classmethod
+    def explain_query(cls, db_path, sql, params=None):
+        """
+        EXPLAIN QUERY PLAN details for sql. Placeholders default to the values sql
+        first ran with, or NULL when it hasn't run yet.
+        """
+        if params is None:
+            params = BaseModel._sample_params.get(sql) or [None] * sql.count("?")
+        with cls.get_connection(db_path) as conn:
+            return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+    @classmethod
+    def advise_indexes(cls, db_path=None, statements=None):
+        """
+        Runs EXPLAIN QUERY PLAN over statements (default: captured_statements()) and
+        reports full table scans / temp sorts with the indexes that could avoid them.
+
+        Statements are planned with the parameters they first ran with. A LIKE
+        statement that never ran is planned with NULLs, which rules out the LIKE
+        prefix optimization: its report is marked "inconclusive" and suggests nothing.
+
+        Returns:
+            [{"sql", "plan", "scans", "inconclusive", "suggested": [(table, (columns...)), ...]}, ...]
+        """
+        db_path = db_path or cls.db_path
+        statements = cls.captured_statements() if statements is None else statements
+
+        reports = []
+        for sql in statements:
+            plan = cls.explain_query(db_path, sql)
+            aliases = cls._sql_aliases(sql)
+
+            scans = []
+            for detail in plan:
+                match = re.match(r"SCAN (\w+)$", detail)
+                if match and match.group(1) in aliases:
+                    scans.append(aliases[match.group(1)])
+            sorts = any("TEMP B-TREE FOR ORDER BY" in detail for detail in plan)
+            if not scans and not sorts:
+                continue
+
+            inconclusive = sql not in BaseModel._sample_params and bool(re.search(r"\bLIKE\b", sql, re.IGNORECASE))
+            suggested = []
+            with cls.get_connection(db_path) as conn:
+                for table, columns in cls._indexable_columns(conn, sql, aliases):
+                    for column, use in columns:
+                        wanted = table in scans if use == "where" else sorts
+                        if wanted and not inconclusive and column != "id" \
+                                and not cls._has_leading_index(conn, table, column):
+                            suggested.append((table, (column,)))
+
+            reports.append({
+                "sql": " ".join(sql.split()),
+                "plan": plan,
+                "scans": scans,
+                "inconclusive": inconclusive,
+                "suggested": list(dict.fromkeys(suggested)),
+            })
+        return reports
+
+    @staticmethod
+    def _sql_aliases(sql):
+        """alias (or table name) → table for every FROM / JOIN source in sql"""
+        aliases = {}
+        keywords = {"WHERE", "LEFT", "RIGHT", "INNER", "OUTER", "CROSS", "JOIN", "ON", "ORDER", "LIMIT", "GROUP"}
+        for table, alias in re.findall(r"\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?", sql, re.IGNORECASE):
+            aliases[table] = table
+            if alias and alias.upper() not in keywords:
+                aliases[alias] = table
+        return aliases
+
+    @staticmethod
+    def _indexable_columns(conn, sql, aliases):
+        """
+        (table, [(column, "where" | "order"), ...]) for columns used by index-friendly
+        predicates (=, <, >, IN) and ORDER BY. Infix LIKE can't use a b-tree → ignored.
+        """
+        tables = list(dict.fromkeys(aliases.values()))
+        table_columns = {
+            table: {row[1] for row in conn.execute(f"PRAGMA table_info({table})")} for table in tables
+        }
+
+        def resolve(qualifier, column):
+            if qualifier:
+                table = aliases.get(qualifier)
+                return table if table and column in table_columns.get(table, ()) else None
+            return next((table for table in tables if column in table_columns[table]), None)
+
+        found = {}
+        for qualifier, column in re.findall(r"(?:\b(\w+)\.)?\b(\w+)\s*(?:=|<|>|\bIN\b)", sql):
+            table = resolve(qualifier, column)
+            if table:
+                found.setdefault(table, {}).setdefault(column, "where")
+
+        order = re.search(r"\bORDER\s+BY\s+(.+?)(?:\bLIMIT\b|$)", sql, re.IGNORECASE | re.DOTALL)
+        if order:
+            for term in order.group(1).split(","):
+                parts = term.strip().split()[0].split(".")
+                table = resolve(parts[0] if len(parts) == 2 else None, parts[-1])
+                if table:
+                    found.setdefault(table, {}).setdefault(parts[-1], "order")
+
+        return [(table, list(columns.items())) for table, columns in found.items()]
+
+    @staticmethod
+    def _has_leading_index(conn, table, column):
+        for index in conn.execute(f"PRAGMA index_list({table})"):
+            info = conn.execute(f"PRAGMA index_info({index[1]})").fetchall()
+            if info and info[0][2] == column:
+                return True
+        return False
+
     @classmethod
     def get_ambiguous_fields(cls):
         """
@@ -32,6 +1077,12 @@ class BaseModel:
         custom_fields=None,
         debug=False,
         table_alias=None,
+        pagination_mode="offset",
+        cursor=None,
+        sort_key=None,
+        count_mode=None,
+        order_by=None,
+        include=None,
     ):
         """
         Generic SQLite SELECT handler with optional LEFT JOINs, filters, search, and pagination.
@@ -40,8 +1091,10 @@ class BaseModel:
             db_path (str): Path to SQLite database
             table_name (str): Main table name
             fields (list): List of main table fields
-            filters (dict): Filters in key=value form
-            search (str): Search term applied across all selected fields
+            filters (dict): "<field>__<op>": value pairs (eq, in, prefix, contains, gte, lte,
+                gt, lt, isnull); a plain "<field>" key means contains
+            search (str): Search term applied across all selected fields (or, once the
+                model's FTS5 index exists, a prefix MATCH over its searchable fields)
             pagination (bool): Whether to paginate
             items_per_page (int): Number of items per page
             page (int): Page number (1-based)
@@ -49,87 +1102,207 @@ class BaseModel:
             custom_fields (list): Fields corresponding to custom_query for mapping
             debug (bool): Print SQL debug info
             table_alias (str): Alias for main table (used in joins and ambiguous fields)
+            pagination_mode (str): "offset" (LIMIT/OFFSET) or "keyset" (seek by cursor)
+            cursor (str): Opaque cursor from a previous keyset result ("next_cursor"/"prev_cursor")
+            sort_key (str): Keyset sort column (main table, ideally indexed); defaults to cls.keyset_key
+            count_mode (str): "window" or "separate"; defaults to cls.count_mode
+            order_by (str | list): Sort columns, e.g. "-created_at,username" or
+                ["-created_at", "username"] ("-" = descending); must be selected
+                columns. Defaults to cls.default_order_by (None / "" → no ORDER BY, or
+                just id when paginating); id is appended as tiebreaker when selected.
+            include (list): Relations (cls.relations) to load for the page, one batched
+                query each; their mapped fields can also be filtered / searched / sorted
+
+        Keyset mode orders by (sort_key, id) and seeks past the cursor row instead of
+        skipping OFFSET rows, so deep pages cost the same as the first one. The result
+        dict then also carries "next_cursor" / "prev_cursor" (None at either end).
+        An order_by on a single main-table column (either direction) becomes the keyset
+        sort; multi-column or joined-column sorts page with LIMIT/OFFSET instead.
+
+        Totals are cached per (query, params) and reused until one of the queried
+        tables is written, so paging within the same filter never re-counts.
         """
-        import sqlite3
-
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-
         final_fields = custom_fields or fields
         base_query = custom_query or f"SELECT {', '.join(fields)} FROM {table_name}"
 
         # Use alias if provided, else default to table_name
         alias = table_alias or table_name
+        keyset = pagination and pagination_mode == "keyset"
 
-        # Get ambiguous fields from the model
-        ambiguous_fields = getattr(cls, "get_ambiguous_fields", lambda: [])()
-
-        where_clauses = []
-        params = []
+        # -----------------------
+        # Filters + search
+        # -----------------------
+        filter_shape, search_shape, params = cls._prepare_where(
+            db_path, table_name, final_fields, filters, search
+        )
 
         # -----------------------
-        # Filters
+        # Sort order
         # -----------------------
-        if filters:
-            for key, value in filters.items():
-                if value is None or value == "":
-                    continue
-
-                # Automatically prefix ambiguous fields with main table alias
-                field_name = f"{alias}.{key}" if key in ambiguous_fields else key
-
-                if key.endswith("_from"):
-                    field_name = field_name.replace("_from", "")
-                    where_clauses.append(f"{field_name} >= ?")
-                    params.append(value)
-                elif key.endswith("_to"):
-                    field_name = field_name.replace("_to", "")
-                    where_clauses.append(f"{field_name} <= ?")
-                    params.append(value)
-                else:
-                    where_clauses.append(f"LOWER({field_name}) LIKE ?")
-                    params.append(f"%{str(value).lower()}%")
+        sortable = list(final_fields) + list(cls._unselected_relation_fields(final_fields))
+        if order_by is None:
+            order_shape = cls._default_order(sortable)
+        else:
+            order_shape = cls._parse_order_by(order_by, sortable)
+        if pagination and not order_shape and "id" in final_fields:
+            order_shape = (("id", False),)  # LIMIT / OFFSET pages need a stable order
+        descending = False
+        if keyset and order_by and not cursor:
+            seek_key = cls._keyset_sort(order_shape, fields)
+            if seek_key:
+                sort_key, descending = seek_key
+            else:
+                keyset = False  # no single-column seek for this order → LIMIT/OFFSET
 
         # -----------------------
-        # Search
+        # Keyset (seek) position
         # -----------------------
-        if search and search.strip() != "":
-            search_clauses = [
-                f"LOWER({alias}.{col}) LIKE ?" if col in ambiguous_fields else f"LOWER({col}) LIKE ?"
-                for col in final_fields
-            ]
-            where_clauses.append("(" + " OR ".join(search_clauses) + ")")
-            for _ in final_fields:
-                params.append(f"%{search.lower()}%")
+        position = None
+        direction = "next"
+        seek_shape = None
+        seek_params = []
+
+        if keyset:
+            position = cls.decode_cursor(cursor) if cursor else None
+            if position:
+                sort_key = position["key"]
+                direction = position["direction"]
+                descending = position["descending"]
+                page = position["page"]
+            sort_key = sort_key or cls.keyset_key
+
+            if sort_key not in fields or sort_key not in final_fields or "id" not in final_fields:
+                raise ValueError(f"Keyset sort key '{sort_key}' must be a selected column of {table_name}")
+
+            seek_shape = (sort_key, direction, position is not None, bool(position) and position["value"] is None,
+                          descending, sort_key in cls.get_case_insensitive_fields())
+            seek_params = cls._keyset_params(sort_key, position)
+            order_shape = ()  # the seek supplies its own ORDER BY
 
         # -----------------------
-        # Apply WHERE
+        # Compiled statement (built once per query shape)
         # -----------------------
-        final_query = base_query
-        if where_clauses:
-            final_query += " WHERE " + " AND ".join(where_clauses)
+        statement = cls._compiled(
+            ("index", cls, table_name, base_query, tuple(fields), tuple(final_fields), alias,
+             filter_shape, search_shape, pagination, seek_shape, order_shape),
+            lambda: cls._compile_index(
+                table_name, base_query, fields, final_fields, alias, filter_shape, search_shape,
+                pagination, seek_shape, order_shape,
+            ),
+        )
+
+        count_query = statement["count_sql"]
+        count_params = params
+        final_query = statement["page_sql"]
+        page_params = params + seek_params
 
         # -----------------------
         # Pagination
         # -----------------------
-        total_rows = None
         if pagination:
-            total_rows_query = f"SELECT COUNT(*) FROM ({final_query})"
-            cursor.execute(total_rows_query, params)
-            total_rows = cursor.fetchone()[0]
-
-            offset = (page - 1) * items_per_page
-            final_query += f" LIMIT {items_per_page} OFFSET {offset}"
+            if keyset:
+                # One extra row tells us whether another page exists
+                offset = 0 if position else (page - 1) * items_per_page
+                page_params += [items_per_page + 1, offset]
+            else:
+                page_params += [items_per_page, (page - 1) * items_per_page]
 
         # -----------------------
-        # Execute query
+        # Result cache (same statement + params → same rows until a write)
         # -----------------------
-        cursor.execute(final_query, params)
-        rows = cursor.fetchall()
-        conn.close()
+        shared_caches = cls._shared_caches(db_path)
+        result_key = result_tables = versions = None
+        if BaseModel.result_cache_enabled and not debug and shared_caches and statement["tables"] is not None:
+            result_tables = [cls._table_key(db_path, table) for table in statement["tables"]]
+            versions = tuple(cls.get_table_version(db_path, table) for table in statement["tables"])
+            # Offset and keyset pages can share SQL; cursors / page numbers differ
+            result_key = (
+                os.path.abspath(db_path), statement["page_sql"], tuple(page_params),
+                "keyset" if keyset else "offset", direction, items_per_page if pagination else None,
+                page if pagination else None,
+            )
+            cached = BaseModel._result_cache.get(result_key, versions)
+            if cached is not None:
+                rows, total_rows, next_cursor, prev_cursor = cached
+                return cls._index_result(rows, final_fields, pagination, items_per_page, page,
+                                         total_rows, keyset, next_cursor, prev_cursor, include, db_path)
 
-        # Map rows → class objects
-        data = [cls(**dict(zip(final_fields, row))) for row in rows]
+        total_rows = None
+        if pagination:
+            count_signature = None
+            if shared_caches and statement["tables"] is not None:
+                count_signature = cls._count_signature(db_path, statement["tables"], count_query, count_params)
+                total_rows = cls._get_cached_count(count_signature)
+
+        # Single pass: the page query also returns the total (not possible once a
+        # keyset seek predicate narrows the rows)
+        use_window = (
+            pagination
+            and total_rows is None
+            and (count_mode or cls.count_mode) == "window"
+            and statement["window_sql"] is not None
+            and not (keyset and position)
+        )
+
+        remember_rows = (
+            BaseModel.row_cache_enabled and not debug and shared_caches
+            and cls._is_plain_select(table_name, fields, base_query)
+        )
+        row_version = cls.get_table_version(db_path, table_name) if remember_rows else None
+
+        # The page and a separate COUNT must see the same rows
+        consistent = pagination and total_rows is None and cls.consistent_reads
+
+        with cls.get_connection(db_path) as conn, (cls._read_transaction(conn) if consistent else nullcontext()):
+            # -----------------------
+            # Execute query
+            # -----------------------
+            if use_window:
+                final_query = statement["window_sql"]
+                rows = cls._execute(conn, final_query, page_params, fetch="all")
+                if rows:
+                    total_rows = rows[0][0]
+                    rows = [row[1:] for row in rows]
+            else:
+                rows = cls._execute(conn, final_query, page_params, fetch="all")
+
+            # Cache miss and no window total (e.g. past the last page) → count
+            if pagination and total_rows is None:
+                total_rows = cls._execute(conn, count_query, count_params, fetch="one")[0]
+
+        if pagination and count_signature is not None:
+            cls._set_cached_count(count_signature, total_rows)
+
+        next_cursor = prev_cursor = None
+        if keyset:
+            has_more = len(rows) > items_per_page
+            rows = rows[:items_per_page]
+            if direction == "prev":
+                rows.reverse()
+                has_next, has_prev = True, has_more
+            else:
+                has_next, has_prev = has_more, page > 1
+
+            if rows:
+                key_index = final_fields.index(sort_key)
+                id_index = final_fields.index("id")
+                if has_next:
+                    last = rows[-1]
+                    next_cursor = cls.encode_cursor(sort_key, last[key_index], last[id_index], "next", page + 1,
+                                                    descending)
+                if has_prev:
+                    first = rows[0]
+                    prev_cursor = cls.encode_cursor(sort_key, first[key_index], first[id_index], "prev", page - 1,
+                                                    descending)
+
+        if result_key is not None:
+            BaseModel._result_cache.set(result_key, (rows, total_rows, next_cursor, prev_cursor),
+                                        result_tables, versions)
+        if remember_rows:
+            cls._remember_rows(db_path, table_name, final_fields, rows, row_version)
+
+        result = cls._index_result(rows, final_fields, pagination, items_per_page, page,
+                                   total_rows, keyset, next_cursor, prev_cursor, include, db_path)
 
         # -----------------------
         # Debug
@@ -137,7 +1310,7 @@ class BaseModel:
         if debug:
             print("\n====== SQL DEBUG ======")
             print("SQL Query:", final_query)
-            print("Params:", params)
+            print("Params:", page_params)
             if filters:
                 print("Filters:", filters)
             if pagination:
@@ -145,22 +1318,478 @@ class BaseModel:
                 print("Total Rows (before pagination):", total_rows)
             print("data:")
             from utils.debug import print_r
-            print_r(data)
+            print_r(result["data"] if pagination else result)
             print("=======================\n")
 
-        # -----------------------
-        # Conditional return
-        # -----------------------
+        return result
+
+    @classmethod
+    def _index_result(cls, rows, final_fields, pagination, items_per_page, page,
+                      total_rows, keyset, next_cursor, prev_cursor, include=None, db_path=None):
+        """Wraps raw rows in a lazy ResultSet and shapes index_sqlite()'s return value."""
+        data = ResultSet(cls, final_fields, rows)
+        if include:
+            cls.load_relations(data, include, db_path)
+
         if pagination:
-            return {
+            result = {
                 "data": data,
                 "total_rows": total_rows,
                 "total_pages": (total_rows + items_per_page - 1) // items_per_page,
                 "last_page": page,
             }
+            if keyset:
+                result["next_cursor"] = next_cursor
+                result["prev_cursor"] = prev_cursor
+            return result
 
         return data
 
+    @classmethod
+    def iter_sqlite(
+        cls,
+        db_path,
+        table_name,
+        fields,
+        filters=None,
+        search=None,
+        custom_query=None,
+        custom_fields=None,
+        table_alias=None,
+        batch_size=500,
+        include=None,
+    ):
+        """
+        Streaming variant of index_sqlite: same filters/search, but rows are pulled
+        with fetchmany(batch_size) and yielded as model objects one at a time, so
+        walking a whole table never holds it in memory. Relations in include are
+        loaded per batch (one query per relation per batch).
+
+        The pooled connection is held until the generator is exhausted or closed.
+
+        Usage:
+            for user in User.index_iter(filters={"account_status": "active"}):
+                ...
+        """
+        final_fields = custom_fields or fields
+        base_query = custom_query or f"SELECT {', '.join(fields)} FROM {table_name}"
+        alias = table_alias or table_name
+
+        filter_shape, search_shape, params = cls._prepare_where(
+            db_path, table_name, final_fields, filters, search
+        )
+        statement = cls._compiled(
+            ("index", cls, table_name, base_query, tuple(fields), tuple(final_fields), alias,
+             filter_shape, search_shape, False, None, ()),
+            lambda: cls._compile_index(
+                table_name, base_query, fields, final_fields, alias, filter_shape, search_shape, False, None, ()
+            ),
+        )
+
+        # Timed: execute + fetchmany calls only (not the time the consumer spends per row)
+        elapsed, fetched = 0.0, 0
+        with cls.get_connection(db_path) as conn:
+            try:
+                start = time.perf_counter()
+                db_cursor = conn.execute(statement["page_sql"], params)
+                while True:
+                    rows = db_cursor.fetchmany(batch_size)
+                    elapsed += time.perf_counter() - start
+                    if not rows:
+                        break
+                    fetched += len(rows)
+                    batch = [cls.from_row(row, final_fields) for row in rows]
+                    if include:
+                        cls.load_relations(batch, include, db_path)
+                    yield from batch
+                    start = time.perf_counter()
+            finally:
+                QueryMonitor.record(statement["page_sql"], params, elapsed, fetched)
+
+    @classmethod
+    def index_iter(cls, filters=None, search=None, batch_size=500):
+        """Streams the model's own table (models with JOINs override this)."""
+        return cls.iter_sqlite(
+            cls.db_path, cls.table_name, cls.fields,
+            filters=filters, search=search, batch_size=batch_size, include=cls.default_include,
+        )
+
+    # -----------------------
+    # Keyset cursor helpers
+    # -----------------------
+    @staticmethod
+    def encode_cursor(sort_key, value, row_id, direction, page, descending=False):
+        """Packs a seek position into an opaque, URL-safe string."""
+        data = {"k": sort_key, "v": value, "id": row_id, "d": direction, "p": page}
+        if descending:
+            data["r"] = 1
+        payload = json.dumps(data, separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+    @staticmethod
+    def decode_cursor(cursor):
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+            return {
+                "key": payload["k"],
+                "value": payload["v"],
+                "id": payload["id"],
+                "direction": payload["d"] if payload["d"] in ("next", "prev") else "next",
+                "page": max(int(payload["p"]), 1),
+                "descending": bool(payload.get("r")),
+            }
+        except (ValueError, KeyError, TypeError, AttributeError):
+            raise ValueError("Invalid pagination cursor")
+
+    @staticmethod
+    def _keyset_clauses(alias, sort_key, seek_shape):
+        """
+        WHERE clauses + ORDER BY for seeking past a cursor row on (sort_key, id).
+        NULL sort values sort first (SQLite ASC order), so they get their own branch.
+        A descending sort walks forward exactly like an ascending one walks back.
+        Bound values come from _keyset_params().
+        """
+        _, direction, has_position, null_value, descending, nocase = seek_shape
+        if descending:
+            direction = "next" if direction == "prev" else "prev"
+        key_col = f"{alias}.{sort_key}" + (" COLLATE NOCASE" if nocase else "")
+        id_col = f"{alias}.id"
+        same_column = sort_key == "id"
+
+        if direction == "prev":
+            order_by = f"{id_col} DESC" if same_column else f"{key_col} DESC, {id_col} DESC"
+        else:
+            order_by = id_col if same_column else f"{key_col}, {id_col}"
+
+        if not has_position:
+            return [], order_by
+
+        if same_column:
+            op = "<" if direction == "prev" else ">"
+            return [f"{id_col} {op} ?"], order_by
+
+        if direction == "prev":
+            if null_value:
+                return [f"({key_col} IS NULL AND {id_col} < ?)"], order_by
+            return [f"({key_col} IS NULL OR ({key_col}, {id_col}) < (?, ?))"], order_by
+
+        if null_value:
+            return [f"(({key_col} IS NULL AND {id_col} > ?) OR {key_col} IS NOT NULL)"], order_by
+        return [f"({key_col}, {id_col}) > (?, ?)"], order_by
+
+    @classmethod
+    def _parse_order_by(cls, order_by, final_fields):
+        """
+        "-created_at, username" or ["-created_at", "username"] →
+        (("created_at", True), ("username", False), ("id", False)) as (column, descending).
+        Only selected columns are accepted (the names end up in SQL); id is appended
+        as a tiebreaker so pages are deterministic.
+        """
+        if not order_by:
+            return ()
+        terms = order_by.split(",") if isinstance(order_by, str) else order_by
+
+        order = []
+        for term in terms:
+            term = str(term).strip()
+            column = term.lstrip("+-").strip()
+            if not column:
+                continue
+            if column not in final_fields:
+                raise ValueError(f"Cannot order by '{column}': not a selected column")
+            if all(column != seen for seen, _ in order):
+                order.append((column, term.startswith("-")))
+
+        if order and "id" in final_fields and all(column != "id" for column, _ in order):
+            order.append(("id", order[-1][1]))
+        return tuple(order)
+
+    @classmethod
+    def _default_order(cls, final_fields):
+        """default_order_by as an order shape, or () when it sorts on unselected columns."""
+        try:
+            return cls._parse_order_by(cls.default_order_by, final_fields)
+        except ValueError:
+            return ()
+
+    @staticmethod
+    def _keyset_sort(order_shape, fields):
+        """(sort_key, descending) when order_shape is one main-table column (+ id tiebreaker), else None."""
+        terms = list(order_shape)
+        if len(terms) == 2 and terms[1][0] == "id" and terms[1][1] == terms[0][1]:
+            terms = terms[:1]
+        if len(terms) != 1 or terms[0][0] not in fields:
+            return None
+        return terms[0]
+
+    @classmethod
+    def _order_clause(cls, alias, fields, final_fields, order_shape):
+        """ORDER BY terms; case-insensitive columns sort (and use their index) with NOCASE."""
+        ambiguous_fields = getattr(cls, "get_ambiguous_fields", lambda: [])()
+        nocase_fields = cls.get_case_insensitive_fields()
+        relation_fields = cls._unselected_relation_fields(final_fields)
+        terms = []
+        for column, descending in order_shape:
+            # Main-table columns go through the alias; joined / computed ones by their output name
+            expression = f"{alias}.{column}" if column in fields or column in ambiguous_fields else column
+            if column in relation_fields:
+                # Related value looked up per row (by primary key) instead of a JOIN
+                related, foreign_key, related_column = relation_fields[column]
+                expression = (
+                    f"(SELECT {related_column} FROM {related.table_name} "
+                    f"WHERE {related.table_name}.id = {alias}.{foreign_key})"
+                )
+                if related_column in related.get_case_insensitive_fields():
+                    expression += " COLLATE NOCASE"
+            elif column in nocase_fields:
+                expression += " COLLATE NOCASE"
+            terms.append(expression + (" DESC" if descending else ""))
+        return ", ".join(terms)
+
+    @staticmethod
+    def _keyset_params(sort_key, position):
+        if not position:
+            return []
+        if sort_key == "id" or position["value"] is None:
+            return [position["id"]]
+        return [position["value"], position["id"]]
+
+    # -----------------------
+    # Statement compilation
+    # -----------------------
+    @classmethod
+    def _prepare_where(cls, db_path, table_name, final_fields, filters, search):
+        """Filters + search → (filter_shape, search_shape, bound params)."""
+        trigram_index = cls._get_trigram_index(db_path, table_name) if filters else {}
+        filter_shape, params = cls._filter_shape(filters, trigram_index)
+
+        search_shape = None
+        if search and search.strip() != "":
+            match_query = cls._search_match_query(search)
+            search_table = cls._get_search_index(db_path, table_name) if match_query else None
+
+            if search_table:
+                # Indexed MATCH over the declared searchable fields
+                search_shape = ("fts", search_table)
+                params.append(match_query)
+            else:
+                search_shape = ("like",)
+                columns = len(final_fields) + len(cls._unselected_relation_fields(final_fields))
+                params.extend([f"%{search.lower()}%"] * columns)
+
+        return filter_shape, search_shape, params
+
+    # Typed filter operators: filters={"<field>__<op>": value}
+    #   eq, in (list), prefix, contains (default), gte / lte / gt / lt, isnull (True / False)
+    # Legacy date-range suffixes: <field>_from → gte, <field>_to → lte (unless the
+    # key is itself a column of the model)
+    FILTER_OPERATORS = ("eq", "in", "prefix", "contains", "gte", "lte", "gt", "lt", "isnull")
+
+    @classmethod
+    def _parse_filter_key(cls, key, default_op="contains"):
+        """'created_at__gte' → ('created_at', 'gte'); legacy suffixes mapped; plain key → default_op."""
+        if "__" in key:
+            field, op = key.rsplit("__", 1)
+            if op not in cls.FILTER_OPERATORS:
+                raise ValueError(f"Unknown filter operator '{op}' in '{key}'")
+            return field, op
+        if key not in cls.__model_slots__:
+            for suffix, op in (("_from", "gte"), ("_to", "lte")):
+                if key.endswith(suffix):
+                    return key[:-len(suffix)], op
+        return key, default_op
+
+    @classmethod
+    def _filter_shape(cls, filters, trigram_index, default_op="contains"):
+        """
+        Splits filters into a hashable shape ((key, kind, extra), ...) that decides the
+        SQL text, and the list of values bound to it (same order).
+        """
+        shape = []
+        params = []
+        for key, value in (filters or {}).items():
+            if value is None or value == "":
+                continue
+            field, op = cls._parse_filter_key(key, default_op)
+
+            if op in ("eq", "gte", "lte", "gt", "lt"):
+                shape.append((field, op, None))
+                params.append(value)
+            elif op == "in":
+                values = list(value) if isinstance(value, (list, tuple, set, frozenset)) else [value]
+                shape.append((field, "in", len(values)))
+                params.extend(values)
+            elif op == "isnull":
+                shape.append((field, "isnull", bool(value)))
+            elif op == "prefix":
+                # Starts-with; LIKE wildcards in the value are matched literally
+                escaped = str(value).lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                shape.append((field, "prefix", None))
+                params.append(escaped + "%")
+            elif field in trigram_index and len(str(value)) >= 3:
+                # Trigram index answers the infix LIKE (needs ≥ 3 characters)
+                shape.append((field, "trigram", trigram_index[field]))
+                params.append(f"%{str(value).lower()}%")
+            else:
+                shape.append((field, "like", None))
+                params.append(f"%{str(value).lower()}%")
+        return tuple(shape), params
+
+    @classmethod
+    def _filter_clauses(cls, alias, filter_shape, selected=()):
+        ambiguous_fields = getattr(cls, "get_ambiguous_fields", lambda: [])()
+        nocase_fields = cls.get_case_insensitive_fields()
+        relation_fields = cls._unselected_relation_fields(selected)
+        comparisons = {"gte": ">=", "lte": "<=", "gt": ">", "lt": "<"}
+        clauses = []
+
+        for key, kind, extra in filter_shape:
+            if key in relation_fields:
+                # Semijoin on the related table instead of a JOIN
+                related, foreign_key, column = relation_fields[key]
+                condition = related._filter_clauses(related.table_name, ((column, kind, extra),), related.fields)[0]
+                clauses.append(
+                    f"{alias}.{foreign_key} IN (SELECT id FROM {related.table_name} WHERE {condition})"
+                )
+                continue
+
+            # Automatically prefix ambiguous fields with main table alias
+            field_name = f"{alias}.{key}" if key in ambiguous_fields else key
+            nocase = key in nocase_fields
+            # LIKE already ignores ASCII case; skipping LOWER() lets a NOCASE index serve it
+            like_target = field_name if nocase else f"LOWER({field_name})"
+
+            if kind in comparisons:
+                clauses.append(f"{field_name} {comparisons[kind]} ?")
+            elif kind == "eq":
+                clauses.append(f"{field_name} = ? COLLATE NOCASE" if nocase else f"{field_name} = ?")
+            elif kind == "in":
+                if not extra:
+                    clauses.append("0")  # empty list matches nothing
+                else:
+                    target = f"{field_name} COLLATE NOCASE" if nocase else field_name
+                    clauses.append(f"{target} IN ({', '.join('?' for _ in range(extra))})")
+            elif kind == "isnull":
+                clauses.append(f"{field_name} IS NULL" if extra else f"{field_name} IS NOT NULL")
+            elif kind == "trigram":
+                clauses.append(f'{alias}.id IN (SELECT rowid FROM {extra} WHERE "{key}" LIKE ?)')
+            elif kind == "prefix":
+                clauses.append(f"{like_target} LIKE ? ESCAPE '\\'")
+            else:
+                clauses.append(f"{like_target} LIKE ?")
+        return clauses
+
+    @classmethod
+    def _compile_index(cls, table_name, base_query, fields, final_fields, alias, filter_shape,
+                       search_shape, pagination, seek_shape, order_shape):
+        ambiguous_fields = getattr(cls, "get_ambiguous_fields", lambda: [])()
+        where_clauses = cls._filter_clauses(alias, filter_shape, final_fields)
+
+        if search_shape and search_shape[0] == "fts":
+            search_table = search_shape[1]
+            where_clauses.append(
+                f"{alias}.id IN (SELECT rowid FROM {search_table} WHERE {search_table} MATCH ?)"
+            )
+        elif search_shape:
+            nocase_fields = cls.get_case_insensitive_fields()
+            relation_fields = cls._unselected_relation_fields(final_fields)
+            search_clauses = []
+            for col in final_fields:
+                column = f"{alias}.{col}" if col in ambiguous_fields else col
+                search_clauses.append(f"{column} LIKE ?" if col in nocase_fields else f"LOWER({column}) LIKE ?")
+            for related, foreign_key, col in relation_fields.values():
+                target = col if col in related.get_case_insensitive_fields() else f"LOWER({col})"
+                search_clauses.append(
+                    f"{alias}.{foreign_key} IN (SELECT id FROM {related.table_name} WHERE {target} LIKE ?)"
+                )
+            where_clauses.append("(" + " OR ".join(search_clauses) + ")")
+
+        def where(clauses):
+            return " WHERE " + " AND ".join(clauses) if clauses else ""
+
+        page_where = where_clauses
+        order_by = None
+        if seek_shape:
+            seek_clauses, order_by = cls._keyset_clauses(alias, seek_shape[0], seek_shape)
+            page_where = where_clauses + seek_clauses
+        elif order_shape:
+            order_by = cls._order_clause(alias, fields, final_fields, order_shape)
+
+        order_sql = f" ORDER BY {order_by}" if order_by else ""
+        limit_sql = " LIMIT ? OFFSET ?" if pagination else ""
+        tables = cls._query_tables(table_name, base_query)
+
+        # Related tables read through relation-field subqueries (filters / search / sort)
+        relation_fields = cls._unselected_relation_fields(final_fields)
+        referenced = {key for key, _, _ in filter_shape} | {column for column, _ in order_shape}
+        related_tables = tuple(sorted({
+            related.table_name for field, (related, _, _) in relation_fields.items()
+            if field in referenced or search_shape == ("like",)
+        }))
+        if tables is not None:
+            tables = tuple(sorted({*tables, *related_tables}))
+
+        page_query = f"{base_query}{where(page_where)}{order_sql}{limit_sql}"
+        return {
+            "count_sql": f"SELECT COUNT(*) FROM ({base_query}{where(where_clauses)})",
+            "page_sql": page_query,
+            "window_sql": cls._with_window_count(page_query) if pagination else None,
+            "tables": tables,
+        }
+
+    @classmethod
+    def _compile_edit(cls, base_query, final_fields, alias, by_id, filter_shape):
+        ambiguous_fields = getattr(cls, "get_ambiguous_fields", lambda: [])()
+        where_clauses = []
+
+        # ID filter
+        if by_id:
+            where_clauses.append(f"{alias}.id = ?" if "id" in ambiguous_fields else "id = ?")
+
+        # Other filters (plain keys are equality; case-insensitive columns use their NOCASE index)
+        where_clauses += cls._filter_clauses(alias, filter_shape, final_fields)
+
+        final_query = base_query
+        if where_clauses:
+            final_query += " WHERE " + " AND ".join(where_clauses)
+        return final_query + " LIMIT 1"  # always fetch only one
+
+    @classmethod
+    def _compiled(cls, key, build):
+        """Returns the cached statement for key, building (and caching) it on a miss."""
+        with cls._cache_lock:
+            statement = BaseModel._statement_cache.get(key)
+            if statement is not None:
+                BaseModel._statement_cache.move_to_end(key)
+                BaseModel._statement_stats["hits"] += 1
+                return statement
+            BaseModel._statement_stats["misses"] += 1
+
+        statement = build()
+
+        with cls._cache_lock:
+            BaseModel._statement_cache[key] = statement
+            while len(BaseModel._statement_cache) > cls.statement_cache_size:
+                BaseModel._statement_cache.popitem(last=False)
+        return statement
+
+    @classmethod
+    def statement_cache_stats(cls):
+        """Compiled statement cache counters: hits, misses, size, hit_ratio."""
+        with cls._cache_lock:
+            stats = dict(BaseModel._statement_stats)
+            stats["size"] = len(BaseModel._statement_cache)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    @classmethod
+    def clear_statement_cache(cls):
+        with cls._cache_lock:
+            BaseModel._statement_cache.clear()
+            BaseModel._statement_stats.update(hits=0, misses=0)
+            BaseModel._sample_params.clear()
+
 
 
     @classmethod
@@ -175,6 +1804,7 @@ class BaseModel:
         custom_fields=None,
         table_alias=None,
         debug=False,
+        include=None,
     ):
         """
         Fetch a single row from SQLite, either by ID or custom filters.
@@ -184,48 +1814,39 @@ class BaseModel:
             table_name (str): Table name
             fields (list): List of fields to select
             row_id (int, optional): ID of row to fetch
-            filters (dict, optional): Other key=value filters
+            filters (dict, optional): Other filters; plain keys match exactly (eq),
+                "<field>__<op>" keys work as in index_sqlite
             custom_query (str, optional): Custom SELECT query
             custom_fields (list, optional): Map SELECT columns → object attributes
             table_alias (str, optional): Alias for main table
             debug (bool, optional): Print debug info
+            include (list, optional): Relations (cls.relations) to load onto the row
 
         Returns:
             Single object of cls or None
         """
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-
         final_fields = custom_fields or fields
         base_query = custom_query or f"SELECT {', '.join(fields)} FROM {table_name}"
         alias = table_alias or table_name
 
-        where_clauses = []
-        params = []
-
-        # ID filter
-        if row_id is not None:
-            if "id" in getattr(cls, "get_ambiguous_fields", lambda: [])():
-                where_clauses.append(f"{alias}.id = ?")
-            else:
-                where_clauses.append("id = ?")
-            params.append(row_id)
-
-        # Other filters
-        if filters:
-            ambiguous_fields = getattr(cls, "get_ambiguous_fields", lambda: [])()
-            for key, value in filters.items():
-                if value is None or value == "":
-                    continue
-                field_name = f"{alias}.{key}" if key in ambiguous_fields else key
-                where_clauses.append(f"{field_name} = ?")
-                params.append(value)
-
-        # Build final query
-        final_query = base_query
-        if where_clauses:
-            final_query += " WHERE " + " AND ".join(where_clauses)
-        final_query += " LIMIT 1"  # always fetch only one
+        # Lookup by primary key on the plain table → served from the row cache when possible
+        lookup_id = None
+        if (BaseModel.row_cache_enabled and not debug and cls._shared_caches(db_path)
+                and cls._is_plain_select(table_name, fields, base_query)):
+            lookup_id = cls._primary_key_lookup(row_id, filters)
+        if lookup_id is not None:
+            row = cls._cached_row(db_path, table_name, lookup_id, final_fields)
+            if row is not None:
+                return cls._edit_result(row, final_fields, include, db_path)
+            row_version = cls.get_table_version(db_path, table_name)
+
+        filter_shape, filter_params = cls._filter_shape(filters, {}, default_op="eq")
+        params = ([] if row_id is None else [row_id]) + filter_params
+
+        final_query = cls._compiled(
+            ("edit", cls, table_name, base_query, tuple(final_fields), alias, row_id is not None, filter_shape),
+            lambda: cls._compile_edit(base_query, final_fields, alias, row_id is not None, filter_shape),
+        )
 
         if debug:
             print("\n====== SQL GET DEBUG ======")
@@ -233,12 +1854,32 @@ class BaseModel:
             print("Params:", params)
             print("===========================\n")
 
-        cursor.execute(final_query, params)
-        row = cursor.fetchone()
-        conn.close()
+        with cls.get_connection(db_path) as conn:
+            row = cls._execute(conn, final_query, params, fetch="one")
+
+        if not row:
+            return None
+        if lookup_id is not None:
+            cls._remember_rows(db_path, table_name, final_fields, [row], row_version)
+        return cls._edit_result(row, final_fields, include, db_path)
 
-        if row:
-            return cls(**dict(zip(final_fields, row)))
+    @classmethod
+    def _edit_result(cls, row, final_fields, include, db_path):
+        obj = cls.from_row(row, final_fields)
+        if include:
+            cls.load_relations([obj], include, db_path)
+        return obj
+
+    @staticmethod
+    def _primary_key_lookup(row_id, filters):
+        """The id when the lookup is by primary key only (row_id, or filters {"id": x}), else None."""
+        filters = {key: value for key, value in (filters or {}).items() if value is not None and value != ""}
+        if not filters:
+            return row_id
+        if row_id is None and len(filters) == 1:
+            key, value = next(iter(filters.items()))
+            if key in ("id", "id__eq") and isinstance(value, (int, str)):
+                return value
         return None
 
 
@@ -246,9 +1887,6 @@ class BaseModel:
 
     @classmethod
     def store_sqlite(cls, db_path, table_name, **kwargs):
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-
         now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         kwargs["created_at"] = now
         kwargs["updated_at"] = now
@@ -257,43 +1895,326 @@ class BaseModel:
         placeholders = ", ".join("?" for _ in kwargs)
         values = list(kwargs.values())
 
-        cursor.execute(
-            f"INSERT INTO {table_name} ({fields}) VALUES ({placeholders})", values
-        )
-        conn.commit()
-        last_id = cursor.lastrowid
-        conn.close()
+        with cls.get_connection(db_path) as conn:
+            cursor = cls._execute(
+                conn, f"INSERT INTO {table_name} ({fields}) VALUES ({placeholders})", values
+            )
+            cls._commit(conn)
+            last_id = cursor.lastrowid
+        cls.bump_table_version(db_path, table_name)
 
         kwargs["id"] = last_id
         return cls(**kwargs)
 
     @classmethod
-    def update_sqlite(cls, db_path, table_name, row_id, **kwargs):
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
+    def store_many_sqlite(cls, db_path, table_name, rows, chunk_size=500):
+        """
+        Bulk INSERT from any iterable/generator of dicts.
+
+        Rows are read chunk_size at a time (the input is never materialized) and
+        each chunk is written with executemany() inside one transaction, so a large
+        load pays one commit per chunk instead of one per row. created_at /
+        updated_at are stamped once for the whole batch.
+
+        Returns:
+            list of inserted ids, in input order
+        """
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        rows = iter(rows)
+        inserted_ids = []
+
+        with cls.get_connection(db_path) as conn:
+            while True:
+                chunk = list(islice(rows, chunk_size))
+                if not chunk:
+                    break
+
+                # executemany needs one column list → split into runs of same keys
+                run_keys, run_values = None, []
+                for row in chunk:
+                    row = {**row, "created_at": now, "updated_at": now}
+                    keys = tuple(row.keys())
+                    if keys != run_keys and run_values:
+                        inserted_ids += cls._insert_run(conn, table_name, run_keys, run_values)
+                        run_values = []
+                    run_keys = keys
+                    run_values.append(tuple(row.values()))
+                if run_values:
+                    inserted_ids += cls._insert_run(conn, table_name, run_keys, run_values)
+
+                cls._commit(conn)
+                cls.bump_table_version(db_path, table_name)
+
+        return inserted_ids
+
+    @classmethod
+    def _insert_run(cls, conn, table_name, keys, values):
+        fields = ", ".join(keys)
+        placeholders = ", ".join("?" for _ in keys)
+        cls._execute(
+            conn, f"INSERT INTO {table_name} ({fields}) VALUES ({placeholders})", values, many=True
+        )
+
+        if "id" in keys:
+            id_index = keys.index("id")
+            return [row[id_index] for row in values]
+
+        # Inside one write transaction new rowids are handed out consecutively
+        last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+        return list(range(last_id - len(values) + 1, last_id + 1))
 
+    @classmethod
+    def store_many(cls, rows, chunk_size=500):
+        """Bulk insert into the model's own table (see store_many_sqlite)."""
+        return cls.store_many_sqlite(cls.db_path, cls.table_name, rows, chunk_size=chunk_size)
+
+    @classmethod
+    def update_sqlite(cls, db_path, table_name, row_id, **kwargs):
         kwargs["updated_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         set_clause = ", ".join(f"{key}=?" for key in kwargs.keys())
         values = list(kwargs.values())
         values.append(row_id)
 
         query = f"UPDATE {table_name} SET {set_clause} WHERE id = ?"
-        cursor.execute(query, values)
-        conn.commit()
-        conn.close()
+        with cls.get_connection(db_path) as conn:
+            cls._execute(conn, query, values)
+            cls._commit(conn)
+        cls.bump_table_version(db_path, table_name)
 
         return True
 
     @classmethod
     def destroy_sqlite(cls, db_path, table_name, row_id):
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-
         query = f"DELETE FROM {table_name} WHERE id=?"
-        cursor.execute(query, (row_id,))
-        conn.commit()
-        conn.close()
+        with cls.get_connection(db_path) as conn:
+            cls._execute(conn, query, (row_id,))
+            cls._commit(conn)
+        cls.bump_table_version(db_path, table_name)
+
+        return True
 
+    # -----------------------
+    # Set-based writes
+    # -----------------------
+    # Max ids bound per "id IN (...)" statement
+    bulk_id_chunk = 500
+
+    @classmethod
+    def _where_from_filters(cls, db_path, table_name, filters):
+        """
+        WHERE clause + params for writes, from index_sqlite-style filters. A plain key
+        is an exact match here (as in edit_sqlite): {"account_status": "active"} must
+        never touch "inactive" rows. Use "<field>__contains" for substring matches.
+        """
+        trigram_index = cls._get_trigram_index(db_path, table_name) if filters else {}
+        filter_shape, params = cls._filter_shape(filters, trigram_index, default_op="eq")
+        if not filter_shape:
+            # Refuse to touch every row by accident (all filters empty)
+            raise ValueError(f"Refusing to write all rows of {table_name}: no filters given")
+
+        where = cls._compiled(
+            ("where", cls, table_name, filter_shape),
+            lambda: " AND ".join(cls._filter_clauses(table_name, filter_shape, cls.fields)),
+        )
+        return where, params
+
+    @staticmethod
+    def _id_chunks(ids, size):
+        ids = iter(ids)
+        while True:
+            chunk = list(islice(ids, size))
+            if not chunk:
+                return
+            yield chunk
+
+    @classmethod
+    def update_where_sqlite(cls, db_path, table_name, filters, **kwargs):
+        """
+        UPDATE every row matching filters (index_sqlite operators; plain keys are
+        exact matches) in one statement. Returns the number of rows changed.
+        """
+        where, params = cls._where_from_filters(db_path, table_name, filters)
+        kwargs["updated_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        set_clause = ", ".join(f"{key}=?" for key in kwargs.keys())
+
+        query = f"UPDATE {table_name} SET {set_clause} WHERE {where}"
+        with cls.get_connection(db_path) as conn:
+            affected = cls._execute(conn, query, list(kwargs.values()) + params).rowcount
+            cls._commit(conn)
+        cls.bump_table_version(db_path, table_name)
+
+        return affected
+
+    @classmethod
+    def destroy_where_sqlite(cls, db_path, table_name, filters):
+        """DELETE every row matching filters. Returns the number of rows deleted."""
+        where, params = cls._where_from_filters(db_path, table_name, filters)
+
+        query = f"DELETE FROM {table_name} WHERE {where}"
+        with cls.get_connection(db_path) as conn:
+            affected = cls._execute(conn, query, params).rowcount
+            cls._commit(conn)
+        cls.bump_table_version(db_path, table_name)
+
+        return affected
+
+    @classmethod
+    def update_many_sqlite(cls, db_path, table_name, ids, **kwargs):
+        """
+        Apply the same values to every id in ids, in a single transaction.
+        Returns the number of rows changed.
+        """
+        kwargs["updated_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        set_clause = ", ".join(f"{key}=?" for key in kwargs.keys())
+        values = list(kwargs.values())
+
+        affected = 0
+        with cls.get_connection(db_path) as conn:
+            for chunk in cls._id_chunks(ids, cls.bulk_id_chunk):
+                placeholders = ", ".join("?" for _ in chunk)
+                query = f"UPDATE {table_name} SET {set_clause} WHERE id IN ({placeholders})"
+                affected += cls._execute(conn, query, values + chunk).rowcount
+            cls._commit(conn)
+        cls.bump_table_version(db_path, table_name)
+
+        return affected
+
+    @classmethod
+    def destroy_many_sqlite(cls, db_path, table_name, ids):
+        """Delete every id in ids, in a single transaction. Returns rows deleted."""
+        affected = 0
+        with cls.get_connection(db_path) as conn:
+            for chunk in cls._id_chunks(ids, cls.bulk_id_chunk):
+                placeholders = ", ".join("?" for _ in chunk)
+                query = f"DELETE FROM {table_name} WHERE id IN ({placeholders})"
+                affected += cls._execute(conn, query, chunk).rowcount
+            cls._commit(conn)
+        cls.bump_table_version(db_path, table_name)
+
+        return affected
+
+    @classmethod
+    def update_where(cls, filters, **kwargs):
+        return cls.update_where_sqlite(cls.db_path, cls.table_name, filters, **kwargs)
+
+    @classmethod
+    def destroy_where(cls, filters):
+        return cls.destroy_where_sqlite(cls.db_path, cls.table_name, filters)
+
+    @classmethod
+    def update_many(cls, ids, **kwargs):
+        return cls.update_many_sqlite(cls.db_path, cls.table_name, ids, **kwargs)
+
+    @classmethod
+    def destroy_many(cls, ids):
+        return cls.destroy_many_sqlite(cls.db_path, cls.table_name, ids)
+
+    # -----------------------
+    # Dirty tracking / save()
+    # -----------------------
+    # Columns save() never writes from the instance (stamped by the writes)
+    untracked_fields = ("id", "created_at", "updated_at")
+
+    def original_values(self):
+        """{field: value} as loaded from the database ({} for objects built in code)."""
+        original = getattr(self, "_original", None)
+        if original is None:
+            return {}
+        fields, row = original
+        return dict(zip(fields, row))
+
+    def changed_fields(self):
+        """
+        {column: current value} for table columns that differ from the loaded row.
+        Columns that were not loaded count as changed once set to a value.
+        """
+        original = self.original_values()
+        changes = {}
+        for field in type(self).fields:
+            if field in self.untracked_fields:
+                continue
+            value = getattr(self, field, None)
+            if field in original:
+                if value != original[field]:
+                    changes[field] = value
+            elif value is not None:
+                changes[field] = value
+        return changes
+
+    def is_dirty(self):
+        return bool(self.changed_fields())
+
+    def fill(self, data):
+        """
+        Assigns form data to table columns. Form values arrive as strings, so
+        they are converted to the type of the value currently held ("3" → 3,
+        "False" → False / 0, "" → None for empty columns); otherwise every
+        submit would look like a change. Alias fields (access_level_name),
+        id and timestamps are ignored, and so is None for a loaded column (an
+        input that produced no value never clears stored data).
+        """
+        fields = type(self).fields
+        original = self.original_values()
+        for key, value in data.items():
+            if key not in fields or key in self.untracked_fields:
+                continue
+            if value is None and key in original:
+                continue
+            setattr(self, key, self._coerce_form_value(getattr(self, key, None), value))
+        return self
+
+    @staticmethod
+    def _coerce_form_value(current, value):
+        if not isinstance(value, str):
+            return value
+        text = value.strip()
+        if current is None:
+            return None if text == "" else value
+        if isinstance(current, (bool, int)):
+            lowered = text.lower()
+            if lowered in ("true", "yes", "enabled"):
+                return type(current)(True)
+            if lowered in ("false", "no", "disabled"):
+                return type(current)(False)
+            try:
+                return type(current)(int(text))
+            except ValueError:
+                return value
+        if isinstance(current, float):
+            try:
+                return float(text)
+            except ValueError:
+                return value
+        return value
+
+    def _mark_clean(self):
+        fields = tuple(type(self).fields)
+        self._original = (fields, tuple(getattr(self, field, None) for field in fields))
+
+    def save(self, db_path=None):
+        """
+        Writes the instance back: UPDATE of the changed columns only, or an
+        INSERT when it has no id yet. Nothing is executed (and no cache is
+        invalidated) when nothing changed.
+
+        Returns:
+            True if a statement was written, False if there was nothing to save
+        """
+        cls = type(self)
+        db_path = db_path or cls.db_path
+
+        if getattr(self, "id", None) is None:
+            stored = cls.store_sqlite(db_path, cls.table_name, **self.changed_fields())
+            for field in cls.untracked_fields:
+                if field in cls.__model_slots__:
+                    setattr(self, field, getattr(stored, field, None))
+        else:
+            changes = self.changed_fields()
+            if not changes:
+                return False
+            cls.update_sqlite(db_path, cls.table_name, self.id, **changes)
+
+        self._mark_clean()
         return True
 
 
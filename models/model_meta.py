@@ -0,0 +1,146 @@
+# models/model_meta.py
+import keyword
+
+
+class AttributeView(dict):
+    """
+    dict snapshot of a slotted model's attributes that writes through.
+
+    Stands in for the instance __dict__ that __slots__ models no longer have,
+    so `row.__dict__[key]`, `key in row.__dict__`, `row.__dict__[key] = value`
+    and json / pprint keep working.
+    """
+
+    __slots__ = ("_owner",)
+
+    def __init__(self, owner):
+        super().__init__()
+        self._owner = owner
+        for name in type(owner).__model_slots__:
+            try:
+                dict.__setitem__(self, name, getattr(owner, name))
+            except AttributeError:
+                pass  # slot never assigned
+
+    def __setitem__(self, key, value):
+        setattr(self._owner, key, value)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        delattr(self._owner, key)
+        dict.__delitem__(self, key)
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def pop(self, key, *default):
+        if key in self:
+            value = self[key]
+            del self[key]
+            return value
+        if default:
+            return default[0]
+        raise KeyError(key)
+
+
+class ModelMeta(type):
+    """
+    Builds every model class as a __slots__ class from its `fields`
+    (+ `extra_fields` for joined / computed columns, + the names of its
+    `relations` and the fields they map, such as access_level_name).
+
+    Classes that don't define their own __init__ get a generated one:
+        __init__(self, id=None, username=None, ..., **ignored)
+    and a matching fast path for query rows, from_row(row, fields).
+
+    Instances built by from_row remember the row they came from in _original
+    (when the class has that slot, see BaseModel.changed_fields).
+    """
+
+    def __new__(mcs, name, bases, namespace):
+        fields = namespace.get("fields", next((b.fields for b in bases if hasattr(b, "fields")), []))
+        extra = namespace.get("extra_fields", next((b.extra_fields for b in bases if hasattr(b, "extra_fields")), []))
+        relations = namespace.get("relations", next((b.relations for b in bases if hasattr(b, "relations")), {}))
+        related = [field for spec in relations.values() for field in spec.get("fields", ())]
+        names = list(dict.fromkeys([*fields, *extra, *relations, *related]))
+
+        inherited = set()
+        for base in bases:
+            inherited.update(getattr(base, "__model_slots__", ()))
+
+        if "__slots__" not in namespace:
+            namespace["__slots__"] = tuple(n for n in names if n not in inherited)
+        namespace["__model_slots__"] = tuple(dict.fromkeys([*inherited, *names]))
+
+        if names and "__init__" not in namespace and all(mcs._valid_name(n) for n in names):
+            namespace["__init__"] = mcs._build_init(names, namespace.get("__qualname__", name))
+
+        cls = super().__new__(mcs, name, bases, namespace)
+        cls._row_loaders = {}
+        return cls
+
+    @staticmethod
+    def _valid_name(name):
+        return name.isidentifier() and not keyword.iskeyword(name)
+
+    @staticmethod
+    def _build_init(names, qualname):
+        args = ", ".join(f"{n}=None" for n in names)
+        body = "\n".join(f"    self.{n} = {n}" for n in names)
+        source = f"def __init__(self, {args}, **_ignored):\n{body}\n"
+        scope = {}
+        exec(source, scope)
+        init = scope["__init__"]
+        init.__qualname__ = f"{qualname}.__init__"
+        init.__generated__ = True
+        return init
+
+    def _build_row_loader(cls, fields):
+        """row tuple (in `fields` order) → instance, without calling __init__"""
+        slots = cls.__model_slots__
+        usable = [f for f in fields if f in slots]
+        if len(usable) != len(fields) or not all(ModelMeta._valid_name(f) for f in slots):
+            return None
+
+        missing = [n for n in slots if n not in fields]
+        lines = ["def load(row):", "    self = new(cls)"]
+        if fields:
+            targets = ", ".join(f"self.{f}" for f in fields)
+            lines.append(f"    {targets}{',' if len(fields) == 1 else ''} = row")
+        lines += [f"    self.{n} = None" for n in missing]
+        if hasattr(cls, "_original"):
+            lines.append("    self._original = (fields, row)")
+        lines.append("    return self")
+
+        scope = {"new": object.__new__, "cls": cls, "fields": fields}
+        exec("\n".join(lines), scope)
+        return scope["load"]
+
+    def from_row(cls, row, fields=None):
+        """
+        Instance from a query row. Uses a generated unpacking loader when the
+        class has the generated __init__; otherwise falls back to cls(**kwargs)
+        so hand-written constructors still run.
+        """
+        fields = tuple(cls.fields if fields is None else fields)
+        if not getattr(cls.__init__, "__generated__", False):
+            return cls._construct(row, fields)
+
+        loader = cls._row_loaders.get(fields)
+        if loader is None:
+            loader = cls._build_row_loader(fields) or (lambda row: cls._construct(row, fields))
+            cls._row_loaders[fields] = loader
+        return loader(row)
+
+    def _construct(cls, row, fields):
+        """from_row through cls(**kwargs), for hand-written constructors."""
+        obj = cls(**dict(zip(fields, row)))
+        if hasattr(cls, "_original"):
+            obj._original = (fields, tuple(row))
+        return obj
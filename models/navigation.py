@@ -1,18 +1,24 @@
 import os
 from models.base_model import BaseModel
+from models.relations import belongs_to, has_many
 
 DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'data.db')
 
 class Navigation(BaseModel):
     table_name = "navigations"
+    db_path = DB_PATH
     fields = ['id', 'menu_name', 'navigation', 'controller', 'navigation_type', 'navigation_order', 'parent_id', 'icon', 'tooltip', 'is_hidden', 'status', 'created_at', 'updated_at']
+    indexes = ['parent_id']
 
-    def __init__(self, **kwargs):
-        for field in self.fields:
-            setattr(self, field, kwargs.get(field))
+    # Menu tree: Navigation.load_relations(menus, "children") → one query per page of menus
+    relations = {
+        'parent': belongs_to('models.navigation.Navigation', 'parent_id'),
+        'children': has_many('models.navigation.Navigation', 'parent_id'),
+    }
 
     @classmethod
-    def index(cls, filters=None, search=None, pagination=False, items_per_page=10, page=1):
+    def index(cls, filters=None, search=None, pagination=False, items_per_page=10, page=1,
+              pagination_mode="offset", cursor=None, sort_key=None, order_by=None):
         return super().index_sqlite(
             DB_PATH,
             cls.table_name,
@@ -21,5 +27,9 @@ class Navigation(BaseModel):
             search=search,
             pagination=pagination,
             items_per_page=items_per_page,
-            page=page
+            page=page,
+            pagination_mode=pagination_mode,
+            cursor=cursor,
+            sort_key=sort_key,
+            order_by=order_by,
         )
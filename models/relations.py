@@ -0,0 +1,33 @@
+# models/relations.py
+import importlib
+
+
+def belongs_to(model, foreign_key, fields=None):
+    """
+    This model's foreign_key column points at model.id (one related row or None).
+
+    fields maps related columns onto this model as extra fields, e.g.
+    {"access_level_name": "access_level_name"} gives every user row an
+    access_level_name without a JOIN. Those fields can be filtered, searched
+    and sorted on like the model's own columns (via subqueries).
+    """
+    return {"type": "belongs_to", "model": model, "foreign_key": foreign_key, "fields": dict(fields or {})}
+
+
+def has_many(model, foreign_key):
+    """model.foreign_key points at this model's id (a list of related rows)."""
+    return {"type": "has_many", "model": model, "foreign_key": foreign_key, "fields": {}}
+
+
+def resolve_model(spec):
+    """
+    Related model class for a relation spec. The model may be given as the
+    class itself or as "package.module.ClassName" (resolved on first use, so
+    models can point at each other without circular imports).
+    """
+    model = spec["model"]
+    if isinstance(model, str):
+        module_name, _, class_name = model.rpartition(".")
+        model = getattr(importlib.import_module(module_name), class_name)
+        spec["model"] = model
+    return model
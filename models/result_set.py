@@ -0,0 +1,150 @@
+# models/result_set.py
+
+
+class ResultSet:
+    """
+    List-compatible page of query results.
+
+    Holds the raw row tuples as fetched and only builds a model object when a
+    row is accessed (indexing / iteration), keeping it for later accesses.
+    Column-oriented consumers (Treeview rendering, field post-processing) work
+    on the tuples directly via column(), values() and map_column().
+
+    Usage:
+        users = User.index()
+        len(users), users[0].username, users[:5]
+        users.column("username")                 # → ["admin", ...] (no objects built)
+        users.values(["id", "username"])         # → [(1, "admin"), ...]
+    """
+
+    __slots__ = ("model", "fields", "_field_key", "_rows", "_objects", "_positions")
+
+    def __init__(self, model, fields, rows):
+        self.model = model
+        self.fields = list(fields)
+        self._field_key = tuple(self.fields)
+        self._rows = rows if isinstance(rows, list) else list(rows)
+        self._objects = [None] * len(self._rows)
+        self._positions = {field: index for index, field in enumerate(self.fields)}
+
+    # -----------------------
+    # List protocol
+    # -----------------------
+    def __len__(self):
+        return len(self._rows)
+
+    def __bool__(self):
+        return bool(self._rows)
+
+    def __iter__(self):
+        for index in range(len(self._rows)):
+            yield self._materialize(index)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            subset = ResultSet(self.model, self.fields, self._rows[index])
+            subset._objects = self._objects[index]
+            return subset
+        if index < 0:
+            index += len(self._rows)
+        if not 0 <= index < len(self._rows):
+            raise IndexError("ResultSet index out of range")
+        return self._materialize(index)
+
+    def __eq__(self, other):
+        if isinstance(other, ResultSet):
+            return self.fields == other.fields and self._rows == other._rows
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    def __add__(self, other):
+        if isinstance(other, ResultSet) and other.model is self.model and other.fields == self.fields:
+            joined = ResultSet(self.model, self.fields, self._rows + other._rows)
+            joined._objects = self._objects + other._objects
+            return joined
+        return list(self) + list(other)
+
+    def __radd__(self, other):
+        return list(other) + list(self)
+
+    def __repr__(self):
+        name = getattr(self.model, "__name__", "ResultSet")
+        return f"<ResultSet {name} rows={len(self._rows)} fields={self.fields}>"
+
+    def copy(self):
+        """Shallow copy sharing rows and any objects already built."""
+        duplicate = ResultSet(self.model, self.fields, list(self._rows))
+        duplicate._objects = list(self._objects)
+        return duplicate
+
+    def to_list(self):
+        """Every row as a model object (materializes the whole set)."""
+        return list(self)
+
+    # -----------------------
+    # Column access (no objects built)
+    # -----------------------
+    def column(self, name):
+        position = self._positions[name]
+        return [row[position] for row in self._rows]
+
+    def values(self, columns, default=""):
+        """Rows as tuples of the requested columns (unknown columns → default)."""
+        positions = [self._positions.get(column) for column in columns]
+        return [
+            tuple(default if position is None else row[position] for position in positions)
+            for row in self._rows
+        ]
+
+    def add_column(self, name, values):
+        """
+        Appends column name (one value per row), or replaces it if it exists.
+        Used for related rows / fields loaded after the query (see load_relations).
+        """
+        values = list(values)
+        if len(values) != len(self._rows):
+            raise ValueError(f"add_column('{name}') needs {len(self._rows)} values, got {len(values)}")
+
+        position = self._positions.get(name)
+        if position is None:
+            self.fields.append(name)
+            self._field_key = tuple(self.fields)
+            self._positions[name] = len(self.fields) - 1
+            self._rows = [row + (value,) for row, value in zip(self._rows, values)]
+        else:
+            self._rows = [
+                row[:position] + (value,) + row[position + 1:] for row, value in zip(self._rows, values)
+            ]
+        for obj, value in zip(self._objects, values):
+            if obj is not None:
+                setattr(obj, name, value)
+        return self
+
+    def map_column(self, name, func):
+        """
+        Replaces every value of column name with func(value). Rows are rebuilt,
+        never mutated in place, so a shared (cached) row list stays intact.
+        Objects already built get the new value too.
+        """
+        position = self._positions.get(name)
+        if position is None:
+            return self
+
+        self._rows = [
+            row[:position] + (func(row[position]),) + row[position + 1:] for row in self._rows
+        ]
+        for index, obj in enumerate(self._objects):
+            if obj is not None:
+                setattr(obj, name, self._rows[index][position])
+        return self
+
+    # -----------------------
+    # Materialization
+    # -----------------------
+    def _materialize(self, index):
+        obj = self._objects[index]
+        if obj is None:
+            obj = self.model.from_row(self._rows[index], self._field_key)
+            self._objects[index] = obj
+        return obj
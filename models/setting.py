@@ -15,8 +15,8 @@ class Setting(BaseModel):
     # Add field_definitions to work with BaseService
     field_definitions = {
         "id": {},
-        "setting_name": {"capitalize1st": True},
-        "setting_value": {},
+        "setting_name": {"capitalize1st": True, "searchable": True, "case_insensitive": True},
+        "setting_value": {"searchable": True},
         "setting_options": {
                 "is_hidden": True,
             },
@@ -24,10 +24,6 @@ class Setting(BaseModel):
         "updated_at": {}
     }
 
-    def __init__(self, **kwargs):
-        for field in self.fields:
-            setattr(self, field, kwargs.get(field))
-
     @classmethod
     def index(
         cls,
@@ -40,6 +36,10 @@ class Setting(BaseModel):
         custom_fields=None,      # optional, matches SELECT columns
         table_alias=None,        # optional alias for table in query
         debug=False,
+        pagination_mode="offset",  # "offset" or "keyset"
+        cursor=None,             # keyset cursor from a previous page
+        sort_key=None,           # keyset sort column
+        order_by=None,           # "-created_at,setting_name" style sort
     ):
         """
         Generic index method.
@@ -71,8 +71,17 @@ class Setting(BaseModel):
             custom_fields=custom_fields,
             table_alias=table_alias,
             debug=debug,
+            pagination_mode=pagination_mode,
+            cursor=cursor,
+            sort_key=sort_key,
+            order_by=order_by,
         )
 
+    @classmethod
+    def edit(cls, id=None, filters=None, debug=False):
+        """Fetch a single setting (by id or filters) → Setting or None."""
+        return super().edit_sqlite(DB_PATH, cls.table_name, cls.fields, row_id=id, filters=filters, debug=debug)
+
     @classmethod
     def store(cls, **kwargs):
         return super().store_sqlite(cls.db_path, cls.table_name, **kwargs)
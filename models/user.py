@@ -2,6 +2,7 @@
 import os
 from models.base_model import BaseModel
 from models.access_level import AccessLevel
+from models.relations import belongs_to
 from utils.debug import print_r
 
 DB_PATH = os.path.join(
@@ -11,16 +12,19 @@ DB_PATH = os.path.join(
 
 class User(BaseModel):
     table_name = "users"
+    db_path = DB_PATH
 
     # -----------------------
     # Field Definitions (UI / metadata)
     # -----------------------
     field_definitions = {
         "id": {"alias": "ID", "is_hidden": False, "order": 0, "editable": False},
-        "customId": {"alias": "Employee ID", "order": 1, "editable": True},
-        "username": {"alias": "Username", "order": 2, "editable": True},
+        "customId": {"alias": "Employee ID", "order": 1, "editable": True, "searchable": True},
+        "username": {"alias": "Username", "order": 2, "editable": True, "searchable": True, "trigram": True,
+                     "case_insensitive": True},
         "password": {"alias": "Password", "is_hidden": True},
-        "email": {"alias": "Email", "order": 4, "editable": True},
+        "email": {"alias": "Email", "order": 4, "editable": True, "searchable": True, "trigram": True,
+                  "case_insensitive": True},
         "access_level": {
             "alias": "Access Level",
             "is_hidden": True,
@@ -32,6 +36,8 @@ class User(BaseModel):
             "order": 6,
             "options": ["active", "inactive", "pending"],
             "capitalize1st": True,
+            "searchable": True,
+            "case_insensitive": True,
         },
         "is_locked": {
             "alias": "Locked",
@@ -69,14 +75,19 @@ class User(BaseModel):
         "updated_at",
     ]
 
-    # -----------------------
-    # Constructor
-    # -----------------------
-    def __init__(self, **kwargs):
-        for field in self.fields:
-            setattr(self, field, kwargs.get(field))
-        # Joined field
-        self.access_level_name = kwargs.get("access_level_name")
+    # Secondary indexes (relation key, date range filters); username / email /
+    # account_status get COLLATE NOCASE indexes via "case_insensitive"
+    indexes = ["access_level", "created_at"]
+
+    # access_level → access_levels.id; maps access_level_name onto every user
+    relations = {
+        "access_level_record": belongs_to(
+            AccessLevel, "access_level", fields={"access_level_name": "access_level_name"}
+        ),
+    }
+
+    # Loaded with every index / edit / index_iter (one batched query per page)
+    default_include = ["access_level_record"]
 
     # -----------------------
     # CRUD wrappers
@@ -114,29 +125,14 @@ class User(BaseModel):
         if id is not None:
             filters = {"id": id}
 
-        # -----------------------
-        # Use join query to include access_level_name
-        # -----------------------
-        user_fields = [f"u.{field}" for field in cls.fields]
-        join_query = f"""
-            SELECT
-                {', '.join(user_fields)},
-                a.access_level_name AS access_level_name
-            FROM {cls.table_name} u
-            LEFT JOIN access_levels a
-                ON u.access_level = a.id
-        """
-        custom_fields = cls.fields + ["access_level_name"]
-
+        # access_level_name comes from the access_level_record relation
         return super().edit_sqlite(
             DB_PATH,
             cls.table_name,
             cls.fields,
             filters=filters,
-            custom_query=join_query,
-            custom_fields=custom_fields,
-            table_alias="u",
             debug=debug,
+            include=cls.default_include,
         )
 
 
@@ -149,7 +145,7 @@ class User(BaseModel):
         return super().destroy_sqlite(DB_PATH, cls.table_name, id)
 
     # -----------------------
-    # INDEX (with JOIN)
+    # INDEX (access level loaded per page)
     # -----------------------
     @classmethod
     def index(
@@ -160,22 +156,11 @@ class User(BaseModel):
         items_per_page=10,
         page=1,
         debug=False,
+        pagination_mode="offset",
+        cursor=None,
+        sort_key=None,
+        order_by=None,
     ):
-        # Explicitly prefix user fields to avoid ambiguity
-        user_fields = [f"u.{field}" for field in cls.fields]
-
-        join_query = f"""
-            SELECT
-                {', '.join(user_fields)},
-                a.access_level_name AS access_level_name
-            FROM {cls.table_name} u
-            LEFT JOIN access_levels a
-                ON u.access_level = a.id
-        """
-
-        # Map SELECT columns → object attributes
-        custom_fields = cls.fields + ["access_level_name"]
-
         return super().index_sqlite(
             DB_PATH,
             cls.table_name,
@@ -185,10 +170,25 @@ class User(BaseModel):
             pagination=pagination,
             items_per_page=items_per_page,
             page=page,
-            custom_query=join_query,
-            custom_fields=custom_fields,
-            table_alias="u",   # ✅ important
             debug=debug,
+            pagination_mode=pagination_mode,
+            cursor=cursor,
+            sort_key=sort_key,
+            order_by=order_by,
+            include=cls.default_include,
+        )
+
+    @classmethod
+    def index_iter(cls, filters=None, search=None, batch_size=500):
+        """Streams users (with access_level_name) without loading them all."""
+        return super().iter_sqlite(
+            DB_PATH,
+            cls.table_name,
+            cls.fields,
+            filters=filters,
+            search=search,
+            batch_size=batch_size,
+            include=cls.default_include,
         )
 
     # -----------------------
@@ -199,7 +199,7 @@ class User(BaseModel):
         field_defs = dict(cls.field_definitions)
 
         try:
-            access_levels = AccessLevel.index()
+            access_levels = AccessLevel.index_iter()
             field_defs["access_level"]["options"] = [
                 {"label": al.access_level_name, "value": al.id}
                 for al in access_levels
@@ -37,13 +37,14 @@ class RuleValidator:
                     model_class = getattr(model_module, model_name.capitalize())
 
                     
-                    # Use model's index method with filters
-                    existing = model_class.index(filters={field: value})
-                    # print('Existing records found for uniqueness check:')
-                    # for record in existing:
-                    #     print(f"{field} in existing record: {getattr(record, field, None)}")
+                    # Exact match on the column; the first hit is enough
+                    existing = model_class.index_iter(filters={f"{field}__eq": value}, batch_size=1)
+                    try:
+                        found = next(existing, None) is not None
+                    finally:
+                        existing.close()
 
-                    if len(existing) > 0:
+                    if found:
                         errors.append(f"{name} must be unique.")
                         
                         
@@ -1,26 +1,36 @@
 # services/BaseService.py
 from utils.debug import print_r
+from models.result_set import ResultSet
 
 class BaseService:
     def __init__(self, model):
         self.model = model
 
-    def index(self, filters=None, pagination=False, items_per_page=5, page=1, search=None, debug=False):
+    def index(self, filters=None, pagination=False, items_per_page=5, page=1, search=None, debug=False,
+              pagination_mode="offset", cursor=None, order_by=None):
 
-        results = self.model.index(
-            filters=filters,
-            search=search,
-            pagination=pagination,
-            items_per_page=items_per_page,
-            page=page,
-            debug=debug
-        )
+        # One request → related rows (e.g. access levels) fetched at most once
+        with self.model.relation_scope():
+            results = self.model.index(
+                filters=filters,
+                search=search,
+                pagination=pagination,
+                items_per_page=items_per_page,
+                page=page,
+                debug=debug,
+                pagination_mode=pagination_mode,
+                cursor=cursor,
+                order_by=order_by,
+            )
 
+        next_cursor = prev_cursor = None
         if isinstance(results, dict) and "data" in results:
             data = results["data"]
             total_rows = results["total_rows"]
             total_pages = results["total_pages"]
             last_page = results["last_page"]
+            next_cursor = results.get("next_cursor")
+            prev_cursor = results.get("prev_cursor")
         else:
             data = results
             total_rows = len(data)
@@ -29,34 +39,68 @@ class BaseService:
 
         # Field post-processing (OK to keep)
         if hasattr(self.model, "field_definitions") and self.model.field_definitions:
-            for row in data:
+            if isinstance(data, ResultSet):
+                # Column-wise on the raw rows → no model objects built
                 for field_key, field_def in self.model.field_definitions.items():
-                    if field_key in row.__dict__:
-                        value = row.__dict__[field_key]
-
-                        if field_def.get("capitalize1st") and isinstance(value, str):
-                            row.__dict__[field_key] = value[:1].upper() + value[1:]
-
-                        if "subtitute_table_values" in field_def:
-                            value_map = {
-                                entry["value"]: entry["label"]
-                                for entry in field_def["subtitute_table_values"]
-                            }
-                            row.__dict__[field_key] = value_map.get(value, value)
+                    if field_key in data.fields:
+                        data.map_column(field_key, self._field_formatter(field_def))
+            else:
+                for row in data:
+                    for field_key, field_def in self.model.field_definitions.items():
+                        if field_key in row.__dict__:
+                            row.__dict__[field_key] = self._field_formatter(field_def)(row.__dict__[field_key])
 
         return {
             "data": data,              # already paginated
             "total_rows": total_rows,
             "total_pages": total_pages,
             "last_page": last_page,
+            "next_cursor": next_cursor,
+            "prev_cursor": prev_cursor,
         }
 
 
+    @staticmethod
+    def _field_formatter(field_def):
+        """value → display value, per field_definitions (capitalize1st, subtitute_table_values)"""
+        value_map = None
+        if "subtitute_table_values" in field_def:
+            value_map = {
+                entry["value"]: entry["label"]
+                for entry in field_def["subtitute_table_values"]
+            }
+
+        def format_value(value):
+            if field_def.get("capitalize1st") and isinstance(value, str):
+                value = value[:1].upper() + value[1:]
+            if value_map is not None:
+                value = value_map.get(value, value)
+            return value
+
+        return format_value
+
     def edit(self, id):
-        return self.model.edit(id)
+        with self.model.relation_scope():
+            return self.model.edit(id)
+
+    def cache_stats(self):
+        """Result cache hit ratio / size (shared by every model)"""
+        return self.model.result_cache_stats()
+
+    def transaction(self):
+        """Unit of work on the model's database: `with service.transaction(): ...` commits once."""
+        return self.model.transaction()
+
+    def snapshot(self):
+        """Consistent reads: every query in `with service.snapshot(): ...` sees one point in time."""
+        return self.model.snapshot()
 
     def store(self, data):
-        return self.repository.store(data)
+        return self.model.store(**data)
+
+    def store_many(self, rows, chunk_size=500):
+        """rows: iterable/generator of dicts → list of new ids"""
+        return self.model.store_many(rows, chunk_size=chunk_size)
 
     def update(self, id, data):
         # Handle alias fields if model is provided
@@ -69,8 +113,42 @@ class BaseService:
         #     for alias_field, original_field in origin_map.items():
         #         if alias_field in data:
         #             data[original_field] = data.pop(alias_field)
-   
-        return self.model.update(id, data)
+
+        # Only the columns the form actually changed are written (none → no statement)
+        row = self.model.edit(id)
+        if row is None:
+            return False
+        return row.fill(data).save()
 
     def delete(self, id):
-        return self.repository.destroy(id)
+        return self.model.destroy(id)
+
+    # Set-based writes → affected row counts
+    def update_where(self, filters, data):
+        return self.model.update_where(filters, **data)
+
+    def update_many(self, ids, data):
+        return self.model.update_many(ids, **data)
+
+    def delete_where(self, filters):
+        return self.model.destroy_where(filters)
+
+    def delete_many(self, ids):
+        return self.model.destroy_many(ids)
+
+    # Async counterparts (run on the model layer's db worker pool)
+    async def aindex(self, *args, **kwargs):
+        return await self.model.run_async(self.index, *args, **kwargs)
+
+    async def aedit(self, id):
+        return await self.model.run_async(self.edit, id)
+
+    async def astore(self, data):
+        return await self.model.run_async(self.store, data)
+
+    async def aupdate(self, id, data):
+        return await self.model.run_async(self.update, id, data)
+
+    async def adelete(self, id):
+        return await self.model.run_async(self.delete, id)
+
@@ -1,5 +1,5 @@
 # from repositories.settings_repository import SettingsRepository
-from models.Setting import Setting
+from models.setting import Setting
 from services.BaseService import BaseService
 
 class SettingsService(BaseService):
@@ -7,7 +7,8 @@ class SettingsService(BaseService):
         super().__init__(Setting)
 
     # Override fetch_data for SettingsService
-    def index(self, filters=None, pagination=False, items_per_page=5, page=1, search=None):
+    def index(self, filters=None, pagination=False, items_per_page=5, page=1, search=None,
+              pagination_mode="offset", cursor=None, order_by=None):
         # You can modify filters, transform results, or add extra behavior
         # if filters is None:
         #     filters = {}
@@ -21,7 +22,10 @@ class SettingsService(BaseService):
             pagination=pagination,
             items_per_page=items_per_page,
             page=page,
-            search=search
+            search=search,
+            pagination_mode=pagination_mode,
+            cursor=cursor,
+            order_by=order_by,
         )
 
         # Example: add extra info to the result
@@ -0,0 +1,54 @@
+import sys
+import os
+import shutil
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.base_model import BaseModel
+
+DATA_DB = os.path.join(os.path.dirname(__file__), '..', 'data', 'data.db')
+
+
+class Item(BaseModel):
+    table_name = "items"
+    fields = ["id", "name", "category", "created_at", "updated_at"]
+
+    # Hand-written constructor: rows are built through cls(**kwargs), not the generated loader
+    def __init__(self, **kwargs):
+        for field in self.fields:
+            setattr(self, field, kwargs.get(field))
+
+
+def create_items_table(db_path, rows=()):
+    # Through the pool, so the connection stays idle there for the test
+    with BaseModel.get_connection(db_path) as conn:
+        conn.execute(
+            "CREATE TABLE items (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT, category TEXT, created_at TEXT, updated_at TEXT)"
+        )
+        conn.executemany("INSERT INTO items (name, category) VALUES (?, ?)", rows)
+        conn.commit()
+    return db_path
+
+
+@pytest.fixture
+def empty_items_db(tmp_path):
+    return create_items_table(str(tmp_path / "items.db"))
+
+
+@pytest.fixture
+def items_db(tmp_path):
+    # item01..item23; every fifth has no category
+    return create_items_table(
+        str(tmp_path / "items.db"),
+        [(f"item{i:02d}", None if i % 5 == 0 else f"cat{i % 3}") for i in range(1, 24)],
+    )
+
+
+@pytest.fixture
+def users_db(tmp_path):
+    # Work on a copy so tests never touch data/data.db
+    db_path = str(tmp_path / "data.db")
+    shutil.copy(DATA_DB, db_path)
+    return db_path
@@ -0,0 +1,993 @@
+import sys
+import os
+import sqlite3
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.base_model import BaseModel
+from models.user import User
+from utils.query_monitor import QueryMonitor
+from test.conftest import Item
+
+
+def user_index(db_path, **kwargs):
+    join_query = """
+        SELECT u.id, u.username, u.email, a.access_level_name AS access_level_name
+        FROM users u LEFT JOIN access_levels a ON u.access_level = a.id
+    """
+    return User.index_sqlite(
+        db_path, "users", User.fields,
+        custom_query=join_query,
+        custom_fields=["id", "username", "email", "access_level_name"],
+        table_alias="u",
+        **kwargs,
+    )
+
+
+def walk_keyset(db_path, **kwargs):
+    pages = []
+    result = Item.index_sqlite(db_path, "items", Item.fields, pagination=True,
+                               pagination_mode="keyset", items_per_page=5, **kwargs)
+    pages.append(result)
+    while result["next_cursor"]:
+        result = Item.index_sqlite(db_path, "items", Item.fields, pagination=True,
+                                   pagination_mode="keyset", items_per_page=5,
+                                   cursor=result["next_cursor"], **kwargs)
+        pages.append(result)
+    return pages
+
+
+# -----------------------
+# Keyset pagination
+# -----------------------
+def test_keyset_walks_every_row_once(items_db):
+    pages = walk_keyset(items_db)
+
+    ids = [row.id for page in pages for row in page["data"]]
+    assert ids == list(range(1, 24))
+    assert [page["last_page"] for page in pages] == [1, 2, 3, 4, 5]
+    assert pages[0]["prev_cursor"] is None
+    assert pages[-1]["total_pages"] == 5
+
+
+def test_keyset_prev_cursor_returns_previous_page(items_db):
+    pages = walk_keyset(items_db)
+
+    back = Item.index_sqlite(items_db, "items", Item.fields, pagination=True,
+                             pagination_mode="keyset", items_per_page=5,
+                             cursor=pages[2]["prev_cursor"])
+    assert [row.id for row in back["data"]] == [row.id for row in pages[1]["data"]]
+    assert back["last_page"] == 2
+
+
+def test_keyset_on_nullable_sort_column(items_db):
+    pages = walk_keyset(items_db, sort_key="category")
+
+    rows = [row for page in pages for row in page["data"]]
+    assert sorted(row.id for row in rows) == list(range(1, 24))
+    keys = [(row.category is not None, row.category or "", row.id) for row in rows]
+    assert keys == sorted(keys)
+
+
+def test_keyset_with_filters_and_join(users_db):
+    result = user_index(users_db, filters={"email": "example"}, pagination=True,
+                        pagination_mode="keyset", items_per_page=4)
+    second = user_index(users_db, filters={"email": "example"}, pagination=True,
+                        pagination_mode="keyset", items_per_page=4,
+                        cursor=result["next_cursor"])
+
+    assert result["total_rows"] == second["total_rows"]
+    assert result["data"][-1].id < second["data"][0].id
+    assert all("example" in row.email for row in result["data"] + second["data"])
+
+
+def test_invalid_cursor_raises(items_db):
+    with pytest.raises(ValueError):
+        Item.index_sqlite(items_db, "items", Item.fields, pagination=True,
+                          pagination_mode="keyset", cursor="not-a-cursor")
+
+
+# -----------------------
+# Single-pass count + count cache
+# -----------------------
+def test_window_count_matches_separate_count(users_db):
+    BaseModel.clear_count_cache()
+    window = user_index(users_db, search="example", pagination=True, items_per_page=4, count_mode="window")
+    BaseModel.clear_count_cache()
+    separate = user_index(users_db, search="example", pagination=True, items_per_page=4, count_mode="separate")
+
+    assert window["total_rows"] == separate["total_rows"] > 4
+    assert [row.id for row in window["data"]] == [row.id for row in separate["data"]]
+
+
+def test_window_count_past_last_page(items_db):
+    BaseModel.clear_count_cache()
+    result = Item.index_sqlite(items_db, "items", Item.fields, pagination=True, items_per_page=10, page=9)
+    assert result["data"] == []
+    assert result["total_rows"] == 23
+
+
+def test_count_cache_reused_until_write(items_db):
+    BaseModel.clear_count_cache()
+    first = Item.index_sqlite(items_db, "items", Item.fields, pagination=True, items_per_page=5)
+    assert first["total_rows"] == 23
+
+    # A write behind the model's back is not seen → the cached total is reused
+    with BaseModel.get_connection(items_db) as conn:
+        conn.execute("INSERT INTO items (name) VALUES ('hidden')")
+        conn.commit()
+    second = Item.index_sqlite(items_db, "items", Item.fields, pagination=True, items_per_page=5, page=2)
+    assert second["total_rows"] == 23
+
+    # A model write invalidates it
+    Item.store_sqlite(items_db, "items", name="visible")
+    third = Item.index_sqlite(items_db, "items", Item.fields, pagination=True, items_per_page=5, page=2)
+    assert third["total_rows"] == 25
+
+
+# -----------------------
+# FTS5 search index
+# -----------------------
+def test_search_uses_fts_index_and_triggers(users_db):
+    assert User.create_search_index(users_db)
+
+    assert [row.username for row in user_index(users_db, search="john")] == ["john_smith"]
+    assert {row.username for row in user_index(users_db, search="example inact")} == {"susan89", "emma", "oliver"}
+
+    new_user = User.store_sqlite(users_db, "users", username="zelda", email="z@castle.org")
+    assert [row.id for row in user_index(users_db, search="zel")] == [new_user.id]
+
+    User.update_sqlite(users_db, "users", new_user.id, username="link")
+    assert [row.username for row in user_index(users_db, search="castle")] == ["link"]
+    assert user_index(users_db, search="zel") == []
+
+    User.destroy_sqlite(users_db, "users", new_user.id)
+    assert user_index(users_db, search="castle") == []
+
+
+def test_search_without_fts_index_falls_back_to_like(users_db):
+    assert [row.username for row in user_index(users_db, search="ohn_sm")] == ["john_smith"]
+
+
+# -----------------------
+# Trigram column filters
+# -----------------------
+def test_contains_filter_uses_trigram_index(users_db):
+    assert User.create_trigram_index(users_db)
+
+    by_email = user_index(users_db, filters={"email": "EXAMPLE"})
+    assert len(by_email) == 17
+    assert [row.username for row in user_index(users_db, filters={"username": "ohn_s"})] == ["john_smith"]
+    # Short values fall back to a plain LIKE
+    assert {row.username for row in user_index(users_db, filters={"username": "mi"})} == {"admin", "john_smith", "mike22", "mia"}
+
+    User.update_sqlite(users_db, "users", 1, email="root@example.net")
+    assert len(user_index(users_db, filters={"email": "example"})) == 18
+
+
+# -----------------------
+# Compiled statement cache
+# -----------------------
+def test_statements_compiled_once_per_shape(items_db):
+    BaseModel.clear_statement_cache()
+
+    for page in (1, 2, 3):
+        Item.index_sqlite(items_db, "items", Item.fields, filters={"name": "item"},
+                          pagination=True, items_per_page=5, page=page)
+    Item.index_sqlite(items_db, "items", Item.fields, filters={"name": "item1"},
+                      pagination=True, items_per_page=5, page=1)
+    stats = BaseModel.statement_cache_stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 3
+
+    # A different filter key set is a different statement
+    Item.index_sqlite(items_db, "items", Item.fields, filters={"category": "cat1"},
+                      pagination=True, items_per_page=5)
+    BaseModel.clear_row_cache()  # the pages above cached rows 3 / 4; make the edits query
+    Item.edit_sqlite(items_db, "items", Item.fields, row_id=3)
+    Item.edit_sqlite(items_db, "items", Item.fields, row_id=4)
+    stats = BaseModel.statement_cache_stats()
+    assert stats["misses"] == 3
+    assert stats["hits"] == 4
+    assert Item.edit_sqlite(items_db, "items", Item.fields, row_id=4).name == "item04"
+
+
+# -----------------------
+# Bulk insert
+# -----------------------
+def test_store_many_chunks_generator_and_returns_ids(items_db):
+    BaseModel.clear_count_cache()
+    Item.index_sqlite(items_db, "items", Item.fields, pagination=True)
+
+    rows = ({"name": f"bulk{i}"} for i in range(1200))
+    ids = Item.store_many_sqlite(items_db, "items", rows, chunk_size=500)
+
+    assert ids == list(range(24, 1224))
+    result = Item.index_sqlite(items_db, "items", Item.fields, pagination=True)
+    assert result["total_rows"] == 1223
+
+    last = Item.edit_sqlite(items_db, "items", Item.fields, row_id=ids[-1])
+    assert last.name == "bulk1199"
+    assert last.created_at == Item.edit_sqlite(items_db, "items", Item.fields, row_id=ids[0]).created_at
+
+
+def test_store_many_mixed_columns_keeps_input_order(items_db):
+    rows = [
+        {"name": "a"},
+        {"name": "b", "category": "x"},
+        {"id": 500, "name": "c"},
+        {"name": "d"},
+    ]
+    ids = Item.store_many_sqlite(items_db, "items", rows)
+
+    assert ids == [24, 25, 500, 501]
+    names = [Item.edit_sqlite(items_db, "items", Item.fields, row_id=i).name for i in ids]
+    assert names == ["a", "b", "c", "d"]
+
+
+# -----------------------
+# Set-based update / delete
+# -----------------------
+def test_update_where_and_destroy_where(users_db):
+    locked = User.update_where_sqlite(users_db, "users", {"account_status": "inactive"}, is_locked=True)
+    assert locked == 3
+    assert all(row.is_locked for row in User.index_sqlite(users_db, "users", User.fields,
+                                                          filters={"account_status": "inactive"}))
+
+    deleted = User.destroy_where_sqlite(users_db, "users", {"email__contains": "example", "account_status": "locked"})
+    assert deleted == 2
+    assert len(User.index_sqlite(users_db, "users", User.fields)) == 18
+
+
+def test_where_writes_match_plain_keys_exactly(users_db):
+    statuses = User.index_sqlite(users_db, "users", User.fields).column("account_status")
+    assert statuses.count("active") and statuses.count("inactive")
+
+    def inactive_locks():
+        rows = User.index_sqlite(users_db, "users", User.fields, filters={"account_status__eq": "inactive"})
+        return rows.values(["id", "is_locked"])
+
+    before = inactive_locks()
+    changed = User.update_where_sqlite(users_db, "users", {"account_status": "active"}, is_locked=1)
+    assert changed == statuses.count("active")
+    assert inactive_locks() == before
+
+    assert User.destroy_where_sqlite(users_db, "users", {"account_status": "active"}) == statuses.count("active")
+    remaining = User.index_sqlite(users_db, "users", User.fields).column("account_status")
+    assert remaining.count("inactive") == statuses.count("inactive")
+
+
+def test_where_writes_refuse_empty_filters(users_db):
+    with pytest.raises(ValueError):
+        User.destroy_where_sqlite(users_db, "users", {"username": ""})
+
+
+def test_update_many_and_destroy_many(items_db):
+    BaseModel.bulk_id_chunk = 4
+    try:
+        assert Item.update_many_sqlite(items_db, "items", range(1, 11), category="bulk") == 10
+        assert len(Item.index_sqlite(items_db, "items", Item.fields, filters={"category": "bulk"})) == 10
+        assert Item.destroy_many_sqlite(items_db, "items", [1, 2, 3, 99]) == 3
+    finally:
+        BaseModel.bulk_id_chunk = 500
+    assert len(Item.index_sqlite(items_db, "items", Item.fields)) == 20
+
+
+# -----------------------
+# Streaming iterator
+# -----------------------
+def test_iter_sqlite_matches_index_and_is_lazy(users_db):
+    stream = User.iter_sqlite(users_db, "users", User.fields, filters={"email": "example"}, batch_size=3)
+    first = next(stream)
+    manager_stats = User.connection_stats(users_db)
+    assert manager_stats["in_use"] == 1
+    rest = list(stream)
+    assert User.connection_stats(users_db)["in_use"] == 0
+
+    expected = User.index_sqlite(users_db, "users", User.fields, filters={"email": "example"})
+    assert [row.id for row in [first] + rest] == [row.id for row in expected]
+
+
+def test_closing_iterator_releases_connection(items_db):
+    stream = Item.iter_sqlite(items_db, "items", Item.fields, search="item1")
+    assert next(stream).name == "item10"
+    stream.close()
+    assert Item.connection_stats(items_db)["in_use"] == 0
+
+
+# -----------------------
+# Result cache
+# -----------------------
+def test_result_cache_hits_until_table_write(items_db):
+    BaseModel.clear_result_cache()
+    BaseModel._result_cache.reset_stats()
+
+    first = Item.index_sqlite(items_db, "items", Item.fields, pagination=True, items_per_page=5)
+    again = Item.index_sqlite(items_db, "items", Item.fields, pagination=True, items_per_page=5)
+    assert [row.id for row in again["data"]] == [row.id for row in first["data"]]
+    assert again["data"][0] is not first["data"][0]  # fresh objects per call
+
+    stats = BaseModel.result_cache_stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+    assert stats["hit_ratio"] == 0.5
+
+    Item.update_sqlite(items_db, "items", 1, name="renamed")
+    after = Item.index_sqlite(items_db, "items", Item.fields, pagination=True, items_per_page=5)
+    assert after["data"][0].name == "renamed"
+    assert BaseModel.result_cache_stats()["invalidations"] == 1
+
+
+def test_result_cache_invalidated_by_joined_table_write(users_db):
+    BaseModel.clear_result_cache()
+    before = user_index(users_db, filters={"username": "admin"})
+    with BaseModel.get_connection(users_db) as conn:
+        level_id = conn.execute("SELECT access_level FROM users WHERE id = ?", (before[0].id,)).fetchone()[0]
+    User.update_sqlite(users_db, "access_levels", level_id, access_level_name="Root")
+    after = user_index(users_db, filters={"username": "admin"})
+    assert after[0].access_level_name == "Root"
+
+
+def test_result_cache_tracks_comma_joins_and_subqueries(users_db):
+    queries = [
+        "SELECT u.id, a.access_level_name AS access_level_name FROM users u, access_levels a",
+        "SELECT u.id, (SELECT access_level_name FROM access_levels WHERE id = u.access_level) "
+        "AS access_level_name FROM users u",
+    ]
+    BaseModel.clear_result_cache()
+    for number, query in enumerate(queries):
+        def names():
+            return User.index_sqlite(users_db, "users", User.fields, custom_query=query,
+                                     custom_fields=["id", "access_level_name"],
+                                     table_alias="u").column("access_level_name")
+
+        names()
+        User.update_sqlite(users_db, "access_levels", 1, access_level_name=f"Renamed{number}")
+        assert f"Renamed{number}" in names()
+
+    # Tables that can't be identified → the query is simply not cached
+    assert User._query_tables("users", "WITH x AS (SELECT 1) SELECT * FROM x") is None
+    BaseModel.clear_result_cache()
+    User.index_sqlite(users_db, "users", User.fields, custom_query="WITH x AS (SELECT * FROM users) SELECT * FROM x")
+    assert BaseModel.result_cache_stats()["entries"] == 0
+
+
+def test_result_cache_keeps_offset_and_keyset_pages_apart(items_db):
+    BaseModel.clear_result_cache()
+    offset = Item.index_sqlite(items_db, "items", Item.fields, pagination=True, items_per_page=5)
+    keyset = Item.index_sqlite(items_db, "items", Item.fields, pagination=True, items_per_page=5,
+                               pagination_mode="keyset")
+    assert "next_cursor" not in offset
+    assert keyset["next_cursor"] is not None
+    assert [row.id for row in keyset["data"]] == [row.id for row in offset["data"]]
+
+    second = Item.index_sqlite(items_db, "items", Item.fields, pagination=True, items_per_page=5,
+                               pagination_mode="keyset", cursor=keyset["next_cursor"])
+    assert [row.id for row in second["data"]] == [6, 7, 8, 9, 10]
+
+
+def test_result_cache_respects_entry_limit(items_db):
+    BaseModel.clear_result_cache()
+    BaseModel.configure_result_cache(max_entries=2)
+    try:
+        for page in (1, 2, 3):
+            Item.index_sqlite(items_db, "items", Item.fields, pagination=True, items_per_page=5, page=page)
+        assert BaseModel.result_cache_stats()["entries"] == 2
+    finally:
+        BaseModel.configure_result_cache(max_entries=256)
+
+
+# -----------------------
+# Declared indexes + plan advisor
+# -----------------------
+def test_advisor_reports_scans_until_indexes_exist(users_db):
+    BaseModel.clear_statement_cache()
+    User.edit_sqlite(users_db, "users", User.fields, filters={"username": "admin"})
+    user_index(users_db, filters={"created_at_from": "2000-01-01"})
+
+    suggested = {s for report in User.advise_indexes(users_db) for s in report["suggested"]}
+    assert {("users", ("username",)), ("users", ("created_at",))} <= suggested
+
+    assert "idx_users_created_at" in User.create_indexes(users_db)
+    assert "idx_users_username_nocase" in User.create_nocase_indexes(users_db)
+    plan = User.explain_query(users_db, User.captured_statements()[0])
+    assert any("idx_users_username_nocase" in detail for detail in plan)
+    assert not any(report["suggested"] for report in User.advise_indexes(users_db))
+
+
+def test_advisor_plans_prefix_filters_with_real_parameters(users_db):
+    BaseModel.clear_statement_cache()
+    User.create_nocase_indexes(users_db)
+    User.index_sqlite(users_db, "users", User.fields, filters={"username__prefix": "ad"})
+
+    # Planned with 'ad%' (not NULL), the NOCASE index serves the LIKE
+    assert User.advise_indexes(users_db) == []
+
+    # A LIKE statement that never ran can't be judged: no suggestion from a NULL plan
+    BaseModel._sample_params.clear()
+    reports = User.advise_indexes(users_db)
+    assert reports and all(report["inconclusive"] and not report["suggested"] for report in reports)
+
+
+# -----------------------
+# Case-insensitive (NOCASE) columns
+# -----------------------
+def test_nocase_columns_use_index_for_equality_and_prefix(users_db):
+    User.create_nocase_indexes(users_db)
+
+    assert User.edit_sqlite(users_db, "users", User.fields, filters={"username": "ADMIN"}).username == "admin"
+    prefixed = User.index_sqlite(users_db, "users", User.fields, filters={"username__prefix": "Jo"})
+    assert sorted(row.username for row in prefixed) == ["john_smith"]
+    # Wildcards in a prefix are literal
+    assert User.index_sqlite(users_db, "users", User.fields, filters={"username__prefix": "%"}) == []
+
+    BaseModel.clear_statement_cache()
+    User.edit_sqlite(users_db, "users", User.fields, filters={"email": "x"})
+    User.index_sqlite(users_db, "users", User.fields, filters={"account_status__prefix": "act"})
+    for sql in User.captured_statements():
+        assert "LOWER(" not in sql
+        plan = User.explain_query(users_db, sql, ["ab%"] * sql.count("?"))
+        assert any("_nocase" in detail for detail in plan), plan
+
+
+# -----------------------
+# Typed filter operators
+# -----------------------
+def test_typed_filter_operators(items_db):
+    def names(**filters):
+        return [row.name for row in Item.index_sqlite(items_db, "items", Item.fields, filters=filters)]
+
+    assert names(name__eq="item03") == ["item03"]
+    assert names(name="item0") == [f"item0{i}" for i in range(1, 10)]  # plain key: contains
+    assert names(id__in=[2, 4, 99]) == ["item02", "item04"]
+    assert names(id__in=[]) == []
+    assert names(category__isnull=True) == ["item05", "item10", "item15", "item20"]
+    assert len(names(category__isnull=False)) == 19
+    assert names(id__gt=20, id__lte=22) == ["item21", "item22"]
+    assert names(id_from=22) == names(id__gte=22) == ["item22", "item23"]
+    assert names(name__prefix="item2") == ["item20", "item21", "item22", "item23"]
+
+    with pytest.raises(ValueError):
+        names(name__like="x")
+
+    # edit: plain keys are exact matches, operators work the same way
+    assert Item.edit_sqlite(items_db, "items", Item.fields, filters={"name": "item1"}) is None
+    assert Item.edit_sqlite(items_db, "items", Item.fields, filters={"id__gt": 22}).name == "item23"
+
+
+def test_columns_ending_in_legacy_suffixes_are_plain_filters(items_db):
+    class Message(BaseModel):
+        table_name = "messages"
+        fields = ["id", "reply_to", "name_prefix"]
+
+    with BaseModel.get_connection(items_db) as conn:
+        conn.execute("CREATE TABLE messages (id INTEGER PRIMARY KEY, reply_to TEXT, name_prefix TEXT)")
+        conn.execute("INSERT INTO messages (reply_to, name_prefix) VALUES ('ops@example.com', 'Dr')")
+        conn.commit()
+
+    def ids(**filters):
+        return Message.index_sqlite(items_db, "messages", Message.fields, filters=filters).column("id")
+
+    assert ids(reply_to="ops@") == [1]       # the reply_to column, not "reply <= ?"
+    assert ids(name_prefix="D") == [1]       # contains on the column; the operator is name__prefix
+    assert ids(reply_to__eq="ops@example.com") == [1]
+
+
+def test_eq_and_range_filters_use_indexes(users_db):
+    User.create_indexes(users_db)
+    User.create_nocase_indexes(users_db)
+    BaseModel.clear_statement_cache()
+    user_index(users_db, filters={"username__eq": "ADMIN"})
+    user_index(users_db, filters={"username__in": ["ADMIN", "john_smith"]})
+    user_index(users_db, filters={"created_at__gte": "2000-01-01", "created_at__lt": "2100-01-01"})
+
+    assert [row.username for row in user_index(users_db, filters={"username__eq": "ADMIN"})] == ["admin"]
+    for sql in User.captured_statements():
+        plan = User.explain_query(users_db, sql)
+        assert not any(detail.startswith("SCAN u") for detail in plan), plan
+
+
+# -----------------------
+# Sorting (order_by)
+# -----------------------
+def test_order_by_multi_column_with_offset_pages(items_db):
+    expected = sorted(
+        Item.index_sqlite(items_db, "items", Item.fields, order_by=""),
+        key=lambda row: (row.category is not None, row.category or "", -row.id),
+    )
+    pages = [
+        Item.index_sqlite(items_db, "items", Item.fields, order_by="category, -id",
+                          pagination=True, items_per_page=5, page=page)["data"]
+        for page in range(1, 6)
+    ]
+    assert [row.id for page in pages for row in page] == [row.id for row in expected]
+
+    with pytest.raises(ValueError):
+        Item.index_sqlite(items_db, "items", Item.fields, order_by="name; DROP TABLE items")
+    with pytest.raises(ValueError):
+        Item.index_sqlite(items_db, "items", ["id", "name"], order_by="category")
+
+
+def test_pages_without_order_by_are_ordered_by_id(items_db):
+    with BaseModel.get_connection(items_db) as conn:
+        conn.execute("CREATE INDEX idx_items_category_name ON items (category, name)")
+        conn.commit()
+
+    pages = [
+        Item.index_sqlite(items_db, "items", ["id", "category"], pagination=True, items_per_page=5, page=page,
+                          filters={"category__gte": "cat"})["data"].column("id")
+        for page in range(1, 5)
+    ]
+    ids = [row_id for page in pages for row_id in page]
+    assert ids == sorted(ids) and len(set(ids)) == 19
+    assert any(sql.endswith("ORDER BY items.id LIMIT ? OFFSET ?") for sql in Item.captured_statements())
+
+
+def test_default_order_only_applies_to_selected_columns(items_db):
+    class NewestFirst(Item):
+        default_order_by = "-id"
+
+    ids = [row.id for row in NewestFirst.index_sqlite(items_db, "items", NewestFirst.fields)]
+    assert ids == list(range(23, 0, -1))
+
+    # A projection without id has no default order (and no error)
+    names = NewestFirst.index_sqlite(items_db, "items", NewestFirst.fields,
+                                     custom_query="SELECT name FROM items", custom_fields=["name"])
+    assert len(names) == 23
+    assert "ORDER BY" not in NewestFirst.captured_statements()[-1]
+
+
+def test_order_by_descending_keyset_walk(items_db):
+    pages = walk_keyset(items_db, order_by="-category")
+    walked = [(row.category, row.id) for page in pages for row in page["data"]]
+    # DESC puts NULLs last; id follows the sort direction
+    expected = sorted(((c, i) for c, i in walked if c is not None), reverse=True)
+    assert walked == expected + sorted(((c, i) for c, i in walked if c is None), reverse=True)
+    assert len(walked) == 23
+
+    back = Item.index_sqlite(items_db, "items", Item.fields, pagination=True, pagination_mode="keyset",
+                             items_per_page=5, cursor=pages[2]["prev_cursor"])
+    assert [row.id for row in back["data"]] == [row.id for row in pages[1]["data"]]
+
+    # Multi-column sorts can't seek → the same call pages by OFFSET
+    result = Item.index_sqlite(items_db, "items", Item.fields, pagination=True, pagination_mode="keyset",
+                               items_per_page=5, order_by="category,name")
+    assert "next_cursor" not in result and result["total_rows"] == 23
+
+
+def test_order_by_nocase_column_uses_index(users_db):
+    User.create_nocase_indexes(users_db)
+    BaseModel.clear_statement_cache()
+    names = [row.username for row in User.index_sqlite(users_db, "users", User.fields, order_by="-username")]
+    assert names == sorted(names, key=str.lower, reverse=True)
+
+    pages = [User.index_sqlite(users_db, "users", User.fields, pagination=True, pagination_mode="keyset",
+                               items_per_page=2, order_by="username")]
+    while pages[-1]["next_cursor"]:
+        pages.append(User.index_sqlite(users_db, "users", User.fields, pagination=True, pagination_mode="keyset",
+                                       items_per_page=2, cursor=pages[-1]["next_cursor"]))
+    assert [row.username for page in pages for row in page["data"]] == names[::-1]
+
+    for sql in User.captured_statements():
+        if "ORDER BY" in sql:
+            assert not any("TEMP B-TREE" in detail for detail in User.explain_query(users_db, sql)), sql
+
+
+# -----------------------
+# Relations
+# -----------------------
+def capture_sql():
+    executed = []
+    hook = QueryMonitor.add_hook(lambda event: executed.append(" ".join(event["sql"].split())))
+    return executed, hook
+
+
+def test_belongs_to_loads_page_relations_in_one_query(users_db):
+    BaseModel.clear_result_cache()
+    expected = {row.id: row.access_level_name for row in user_index(users_db)}
+
+    executed, hook = capture_sql()
+    try:
+        users = User.index_sqlite(users_db, "users", User.fields, include=User.default_include)
+    finally:
+        QueryMonitor.remove_hook(hook)
+
+    assert {user.id: user.access_level_name for user in users} == expected
+    assert [sql for sql in executed if "access_levels" in sql] == [
+        "SELECT id, access_level_name, access_level_code FROM access_levels WHERE access_levels.id IN (?, ?, ?)"
+    ]
+    assert len(executed) == 2 and "JOIN" not in executed[0]
+    admin = next(user for user in users if user.username == "admin")
+    assert admin.access_level_record.access_level_name == admin.access_level_name
+
+    edited = User.edit_sqlite(users_db, "users", User.fields, row_id=admin.id, include=User.default_include)
+    assert edited.access_level_name == admin.access_level_name
+
+
+def test_relation_fields_filter_search_and_sort_without_join(users_db):
+    def ids(query):
+        return [row.id for row in query]
+
+    assert ids(User.index_sqlite(users_db, "users", User.fields, filters={"access_level_name__eq": "Staff"})) == \
+        ids(user_index(users_db, filters={"access_level_name": "staff"}))
+    assert ids(User.index_sqlite(users_db, "users", User.fields, search="tenant")) == \
+        ids(user_index(users_db, search="tenant"))
+
+    ordered = User.index_sqlite(users_db, "users", User.fields, order_by="-access_level_name",
+                                include=User.default_include, pagination=True, items_per_page=50)["data"]
+    names = ordered.column("access_level_name")
+    assert names == sorted(names, reverse=True) and len(names) == 20
+
+    # A write to the related table invalidates results filtered through it
+    before = User.index_sqlite(users_db, "users", User.fields, filters={"access_level_name": "Root"})
+    User.update_sqlite(users_db, "access_levels", 1, access_level_name="Root")
+    after = User.index_sqlite(users_db, "users", User.fields, filters={"access_level_name": "Root"})
+    assert before == [] and len(after) > 0
+
+
+def test_has_many_and_relation_scope(users_db):
+    from models.access_level import AccessLevel
+    from models.navigation import Navigation
+
+    BaseModel.clear_result_cache()
+    levels = AccessLevel.index_sqlite(users_db, "access_levels", AccessLevel.fields, include=["users"])
+    assert sum(len(level.users) for level in levels) == 20
+    assert all(user.access_level == level.id for level in levels for user in level.users)
+
+    menus = Navigation.index_sqlite(users_db, "navigations", Navigation.fields,
+                                    filters={"parent_id__isnull": True}, include=["children"])
+    for menu in menus:
+        assert all(child.parent_id == menu.id for child in menu.children)
+    assert any(menu.children for menu in menus)
+
+    with pytest.raises(ValueError):
+        User.load_relations([], ["nope"], users_db)
+
+    # Inside one scope each related row is fetched once; a write drops the table's entries
+    BaseModel.clear_row_cache()
+    executed, hook = capture_sql()
+    try:
+        with BaseModel.relation_scope():
+            User.edit_sqlite(users_db, "users", User.fields, row_id=1, include=User.default_include)
+            User.edit_sqlite(users_db, "users", User.fields, row_id=1, include=User.default_include)
+            assert sum("access_levels" in sql for sql in executed) == 1
+            Navigation.update_sqlite(users_db, "access_levels", 1, access_level_code="X")
+            BaseModel.clear_result_cache()
+            User.edit_sqlite(users_db, "users", User.fields, row_id=1, include=User.default_include)
+            assert sum("FROM access_levels" in sql for sql in executed) == 2
+    finally:
+        QueryMonitor.remove_hook(hook)
+
+
+# -----------------------
+# Row cache (identity map)
+# -----------------------
+def test_edit_served_from_rows_loaded_by_index(users_db):
+    BaseModel.clear_row_cache()
+    BaseModel.clear_result_cache()
+    page = User.index_sqlite(users_db, "users", User.fields, pagination=True, items_per_page=5,
+                             include=User.default_include)["data"]
+
+    executed, hook = capture_sql()
+    try:
+        user = User.edit_sqlite(users_db, "users", User.fields, filters={"id": str(page[2].id)},
+                                include=User.default_include)
+        assert executed == []  # row + its access level both from memory
+        assert (user.username, user.access_level_name) == (page[2].username, page[2].access_level_name)
+        assert user is not page[2]  # callers may edit their copy
+
+        # Other lookups still go to SQL, and fill the cache for next time
+        User.edit_sqlite(users_db, "users", User.fields, filters={"username": user.username})
+        User.edit_sqlite(users_db, "users", User.fields, row_id=page[2].id + 10)
+        User.edit_sqlite(users_db, "users", User.fields, row_id=page[2].id + 10)
+        assert len(executed) == 2
+    finally:
+        QueryMonitor.remove_hook(hook)
+
+    # A write drops the table's cached rows
+    User.update_sqlite(users_db, "users", user.id, email="changed@example.com")
+    assert BaseModel.row_cache_stats()["invalidations"] > 0
+    assert User.edit_sqlite(users_db, "users", User.fields, row_id=user.id).email == "changed@example.com"
+
+    # Rows from joined / aliased queries are never cached
+    BaseModel.clear_row_cache()
+    user_index(users_db, pagination=True)
+    assert BaseModel.row_cache_stats()["entries"] == 0
+
+
+def test_row_cache_is_bounded(items_db):
+    BaseModel.clear_row_cache()
+    BaseModel.configure_row_cache(max_entries=5)
+    try:
+        Item.index_sqlite(items_db, "items", Item.fields)
+        assert BaseModel.row_cache_stats()["entries"] == 5
+        assert Item._cached_row(items_db, "items", 23, Item.fields)[1] == "item23"
+        assert Item._cached_row(items_db, "items", 1, Item.fields) is None
+    finally:
+        BaseModel.configure_row_cache(max_entries=2048)
+        BaseModel.clear_row_cache()
+
+
+# -----------------------
+# Dirty tracking / save()
+# -----------------------
+def test_save_writes_only_changed_columns(users_db):
+    BaseModel.clear_row_cache()
+    user = User.edit_sqlite(users_db, "users", User.fields, row_id=2, include=User.default_include)
+
+    # A form submit sends every field as a string; unchanged values stay clean
+    user.fill({
+        "customId": "000002", "username": "jean", "email": "jean@example.com", "access_level": "1",
+        "is_locked": "False", "temporary_password": "", "access_level_name": "Admin",
+        "updated_at": "2000-01-01 00:00:00",
+    })
+    assert user.changed_fields() == {"email": "jean@example.com"}
+
+    executed, hook = capture_sql()
+    try:
+        assert user.save(users_db) is True
+        assert executed == ["UPDATE users SET email=?, updated_at=? WHERE id = ?"]
+
+        # Nothing changed since → no statement, no cache invalidation
+        invalidations = BaseModel.row_cache_stats()["invalidations"]
+        assert user.save(users_db) is False and not user.is_dirty()
+        assert len(executed) == 1
+        assert BaseModel.row_cache_stats()["invalidations"] == invalidations
+    finally:
+        QueryMonitor.remove_hook(hook)
+
+    assert User.edit_sqlite(users_db, "users", User.fields, row_id=2).email == "jean@example.com"
+
+
+def test_save_inserts_new_objects_then_tracks_them(items_db):
+    item = Item(name="fresh", category="cat9")
+    assert item.save(items_db) is True
+    assert item.id == 24 and item.created_at is not None and not item.is_dirty()
+
+    item.category = "cat1"
+    assert item.changed_fields() == {"category": "cat1"}
+    item.save(items_db)
+    assert Item.edit_sqlite(items_db, "items", Item.fields, row_id=24).category == "cat1"
+
+
+# -----------------------
+# Unit of work (transaction)
+# -----------------------
+def count_committed(db_path):
+    # Separate, unpooled connection: sees committed rows only
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_transaction_commits_once_at_the_end(items_db):
+    with BaseModel.transaction(items_db):
+        assert BaseModel.in_transaction(items_db)
+        first = Item.store_sqlite(items_db, "items", name="a")
+        Item.store_many_sqlite(items_db, "items", [{"name": "b"}, {"name": "c"}])
+        Item.update_sqlite(items_db, "items", first.id, category="new")
+        assert count_committed(items_db) == 23  # nothing visible to other connections yet
+
+        # Reads in the block see its own writes (not stale cached pages)
+        names = Item.index_sqlite(items_db, "items", Item.fields, filters={"category__eq": "new"}).column("name")
+        assert names == ["a"]
+
+    assert not BaseModel.in_transaction(items_db)
+    assert count_committed(items_db) == 26
+
+
+def test_transaction_rollback_and_savepoints(items_db):
+    with pytest.raises(RuntimeError):
+        with BaseModel.transaction(items_db):
+            Item.store_sqlite(items_db, "items", name="lost")
+            assert len(Item.index_sqlite(items_db, "items", Item.fields)) == 24
+            raise RuntimeError("abort")
+    assert count_committed(items_db) == 23
+    assert len(Item.index_sqlite(items_db, "items", Item.fields)) == 23  # cache dropped too
+
+    with BaseModel.transaction(items_db):
+        Item.store_sqlite(items_db, "items", name="kept")
+        with pytest.raises(ValueError):
+            with BaseModel.transaction(items_db):
+                Item.destroy_where_sqlite(items_db, "items", {"name__eq": "kept"})
+                raise ValueError("inner only")
+    assert Item.edit_sqlite(items_db, "items", Item.fields, filters={"name__eq": "kept"}) is not None
+    assert BaseModel.connection_stats(items_db)["in_use"] == 0
+
+
+def test_transaction_reads_never_reach_other_threads(wal_items_db):
+    from concurrent.futures import ThreadPoolExecutor
+
+    def total_elsewhere():
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            return pool.submit(
+                lambda: Item.index_sqlite(wal_items_db, "items", Item.fields, pagination=True).get("total_rows")
+            ).result()
+
+    BaseModel.clear_result_cache()
+    BaseModel.clear_row_cache()
+    with pytest.raises(RuntimeError):
+        with BaseModel.transaction(wal_items_db):
+            item = Item.store_sqlite(wal_items_db, "items", name="uncommitted")
+            assert Item.index_sqlite(wal_items_db, "items", Item.fields, pagination=True)["total_rows"] == 24
+            assert Item.edit_sqlite(wal_items_db, "items", Item.fields, row_id=item.id).name == "uncommitted"
+            assert total_elsewhere() == 23
+            raise RuntimeError("roll back")
+
+    assert Item._cached_row(wal_items_db, "items", 24, Item.fields) is None
+    assert total_elsewhere() == 23
+    assert Item.edit_sqlite(wal_items_db, "items", Item.fields, row_id=24) is None
+
+
+# -----------------------
+# Consistent reads (snapshot)
+# -----------------------
+def external_insert(db_path, name):
+    # Another writer (own connection, outside the pool and the caches)
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("INSERT INTO items (name) VALUES (?)", (name,))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def wal_items_db(items_db):
+    conn = sqlite3.connect(items_db)
+    conn.execute("PRAGMA journal_mode = WAL").fetchall()
+    conn.close()
+    return items_db
+
+
+def test_page_and_count_read_one_snapshot(wal_items_db):
+    BaseModel.clear_result_cache()
+
+    def write_between(event):
+        if event["sql"].lstrip().startswith("SELECT") and "COUNT" not in event["sql"]:
+            QueryMonitor.remove_hook(hook)
+            external_insert(wal_items_db, "racer")
+
+    hook = QueryMonitor.add_hook(write_between)
+    try:
+        result = Item.index_sqlite(wal_items_db, "items", Item.fields, pagination=True,
+                                   items_per_page=5, count_mode="separate")
+    finally:
+        QueryMonitor.remove_hook(hook)
+
+    assert result["total_rows"] == 23  # the insert landed after the page was read
+    assert count_committed(wal_items_db) == 24
+
+
+def test_snapshot_spans_several_queries(wal_items_db):
+    BaseModel.clear_result_cache()
+    with BaseModel.snapshot(wal_items_db):
+        first = Item.index_sqlite(wal_items_db, "items", Item.fields, pagination=True, items_per_page=5)
+        external_insert(wal_items_db, "later")
+        second = Item.index_sqlite(wal_items_db, "items", Item.fields, pagination=True, items_per_page=5, page=5)
+        assert first["total_rows"] == second["total_rows"] == 23
+        assert Item.edit_sqlite(wal_items_db, "items", Item.fields, filters={"name__eq": "later"}) is None
+
+        with pytest.raises(sqlite3.OperationalError):
+            Item.update_sqlite(wal_items_db, "items", 1, name="refused")
+
+    assert Item.index_sqlite(wal_items_db, "items", Item.fields, pagination=True)["total_rows"] == 24
+    assert Item.edit_sqlite(wal_items_db, "items", Item.fields, row_id=1).name == "item01"
+    assert BaseModel.connection_stats(wal_items_db)["in_use"] == 0
+
+
+# -----------------------
+# Async API
+# -----------------------
+class Note(Item):
+    @classmethod
+    def index(cls, **kwargs):
+        return cls.index_sqlite(cls.db_path, cls.table_name, cls.fields, **kwargs)
+
+    @classmethod
+    def edit(cls, id):
+        return cls.edit_sqlite(cls.db_path, cls.table_name, cls.fields, row_id=id)
+
+    @classmethod
+    def store(cls, **kwargs):
+        return cls.store_sqlite(cls.db_path, cls.table_name, **kwargs)
+
+    @classmethod
+    def destroy(cls, id):
+        return cls.destroy_sqlite(cls.db_path, cls.table_name, id)
+
+
+def test_async_api_runs_on_pinned_worker_connections(items_db, monkeypatch):
+    import asyncio
+    from utils.connection_manager import ConnectionManager
+
+    monkeypatch.setattr(Note, "db_path", items_db)
+
+    async def load():
+        stored = await Note.astore(name="async")
+        return await asyncio.gather(
+            Note.aindex(filters={"category": "cat1"}),
+            Note.aindex(pagination=True, items_per_page=5),
+            Note.aedit(stored.id),
+            Note.aedit(1),
+        )
+
+    by_category, page, stored, first = asyncio.run(load())
+    assert all(row.category == "cat1" for row in by_category)
+    assert page["total_rows"] == 24
+    assert (stored.name, first.name) == ("async", "item01")
+
+    manager = ConnectionManager.get(items_db)
+    assert 1 <= manager.stats()["pinned"] <= BaseModel.async_workers
+    assert manager.stats()["in_use"] == 0
+
+    assert asyncio.run(Note.adestroy(stored.id)) is True
+    assert Note.edit(stored.id) is None  # sync API unchanged
+
+    BaseModel.close_connections()
+    assert manager.stats()["pinned"] == 0
+
+
+# -----------------------
+# Lazy ResultSet
+# -----------------------
+class Tagged(Note):
+    built = 0
+    field_definitions = {
+        "name": {"capitalize1st": True},
+        "category": {"subtitute_table_values": [{"label": "One", "value": "cat1"}]},
+    }
+
+    def __init__(self, **kwargs):
+        Tagged.built += 1
+        super().__init__(**kwargs)
+
+
+def test_result_set_is_lazy_and_list_compatible(items_db, monkeypatch):
+    from services.BaseService import BaseService
+
+    monkeypatch.setattr(Tagged, "db_path", items_db)
+    Tagged.built = 0
+    BaseModel.clear_result_cache()
+
+    result = BaseService(Tagged).index(pagination=True, items_per_page=5)
+    data = result["data"]
+    assert Tagged.built == 0
+    assert data.column("name") == ["Item01", "Item02", "Item03", "Item04", "Item05"]
+    assert data.values(["id", "category", "missing"])[0] == (1, "One", "")
+
+    assert len(data) == 5 and len(data[1:3]) == 2
+    assert data[-1].name == "Item05" and data[-1] is data[4]
+    assert Tagged.built == 1
+    assert [row.id for row in data.copy()] == [1, 2, 3, 4, 5]
+
+    # Display formatting never leaks into the cached raw rows
+    again = Tagged.index(pagination=True, items_per_page=5)
+    assert again["data"].column("name")[0] == "item01"
+
+
+# -----------------------
+# __slots__ models
+# -----------------------
+def test_models_are_slotted_with_generated_constructors(users_db):
+    from models.access_level import AccessLevel
+
+    assert "__slots__" in AccessLevel.__dict__ and User.__model_slots__[-1] == "access_level_name"
+    assert getattr(User.__init__, "__generated__", False)
+
+    user = user_index(users_db, filters={"username": "admin"})[0]
+    assert (user.username, user.customId) == ("admin", None)  # not selected → None
+    with pytest.raises(AttributeError):
+        user.not_a_field = 1
+
+    # __dict__ is a write-through view for code written against plain objects
+    view = user.__dict__
+    assert view["access_level_name"] == user.access_level_name
+    view["username"] = "Admin"
+    assert user.username == "Admin"
+
+    built = User(id=5, username="x", unknown="ignored")
+    assert (built.id, built.email, built.access_level_name) == (5, None, None)
@@ -0,0 +1,122 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.connection_manager import ConnectionManager
+from test.conftest import Item
+
+
+def test_connections_are_reused(empty_items_db):
+    db_path = empty_items_db
+    manager = ConnectionManager.get(db_path)
+    manager.reset_stats()
+
+    Item.store_sqlite(db_path, "items", name="alpha")
+    Item.store_sqlite(db_path, "items", name="beta")
+    result = Item.index_sqlite(db_path, "items", Item.fields, pagination=True, items_per_page=1)
+
+    stats = manager.stats()
+    assert result["total_rows"] == 2
+    assert stats["opened"] == 0
+    assert stats["reused"] == 3
+    assert stats["in_use"] == 0
+    manager.close()
+
+
+def test_reuse_disabled_opens_per_call(empty_items_db):
+    db_path = empty_items_db
+    manager = ConnectionManager.get(db_path)
+    manager.close()
+    manager.reuse = False
+    manager.reset_stats()
+    try:
+        Item.store_sqlite(db_path, "items", name="alpha")
+        Item.edit_sqlite(db_path, "items", Item.fields, row_id=1)
+        stats = manager.stats()
+        assert stats["opened"] == 2
+        assert stats["closed"] == 2
+        assert stats["idle"] == 0
+    finally:
+        manager.reuse = True
+
+
+def test_close_all_empties_pool(empty_items_db):
+    db_path = empty_items_db
+    manager = ConnectionManager.get(db_path)
+    assert manager.stats()["idle"] == 1
+
+    ConnectionManager.close_all()
+    assert manager.stats()["idle"] == 0
+
+
+def pragmas(conn):
+    return (
+        conn.execute("PRAGMA journal_mode").fetchone()[0],
+        conn.execute("PRAGMA synchronous").fetchone()[0],
+        conn.execute("PRAGMA temp_store").fetchone()[0],
+    )
+
+
+def test_profile_from_environment(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "env.db")
+    monkeypatch.setenv("DB_PROFILE", "performance")
+    manager = ConnectionManager.get(db_path)
+
+    with manager.connection() as conn:
+        assert pragmas(conn) == ("wal", 1, 2)  # NORMAL, MEMORY
+    assert manager.stats()["profile"] == "performance"
+    manager.close()
+
+
+def test_profile_from_settings_table(tmp_path, monkeypatch):
+    monkeypatch.delenv("DB_PROFILE", raising=False)
+    db_path = str(tmp_path / "settings.db")
+    conn = ConnectionManager.connect(db_path)
+    assert pragmas(conn) == ("delete", 2, 0)  # no settings table yet → default
+    conn.execute("CREATE TABLE settings (id INTEGER PRIMARY KEY, setting_name TEXT, setting_value TEXT)")
+    conn.execute("INSERT INTO settings (setting_name, setting_value) VALUES ('db_profile', 'Performance')")
+    conn.commit()
+    conn.close()
+
+    with ConnectionManager.get(db_path).connection() as conn:
+        assert pragmas(conn)[0] == "wal"
+    ConnectionManager.get(db_path).close()
+
+
+def test_configure_rejects_unknown_profile():
+    try:
+        ConnectionManager.configure(profile="turbo")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("unknown profile accepted")
+    assert ConnectionManager.profile is None
+
+
+def test_pinned_thread_keeps_one_dedicated_connection(empty_items_db):
+    import threading
+
+    db_path = empty_items_db
+    manager = ConnectionManager.get(db_path)
+    seen = []
+
+    def worker():
+        ConnectionManager.pin_thread()
+        try:
+            with manager.connection() as outer:
+                with manager.connection() as inner:
+                    seen.append(outer is inner)
+            with manager.connection() as again:
+                seen.append(again is outer)
+            seen.append(manager.stats()["pinned"])
+        finally:
+            ConnectionManager.unpin_thread()
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+
+    assert seen == [True, True, 1]
+    assert manager.stats()["pinned"] == 0
+    assert manager.stats()["in_use"] == 0
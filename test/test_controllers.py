@@ -0,0 +1,130 @@
+import asyncio
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import models.setting
+import models.user
+from models.base_model import BaseModel
+from models.setting import Setting
+from models.user import User
+from controllers.SettingsController import SettingsController
+from controllers.UsersController import UsersController
+from services.UsersService import UsersService
+from utils.query_monitor import QueryMonitor
+from utils.form_popup import handle_submit
+
+
+@pytest.fixture
+def app_db(users_db, monkeypatch):
+    # Point the models at the copy so tests never touch data/data.db
+    db_path = users_db
+    for module, model in ((models.user, User), (models.setting, Setting)):
+        monkeypatch.setattr(module, "DB_PATH", db_path)
+        monkeypatch.setattr(model, "db_path", db_path)
+    BaseModel.clear_result_cache()
+    BaseModel.clear_row_cache()
+    return db_path
+
+
+def submitted_updates(controller, id, data):
+    executed = []
+    hook = QueryMonitor.add_hook(lambda event: executed.append(" ".join(event["sql"].split())))
+    try:
+        result = controller.update(id, data)
+    finally:
+        QueryMonitor.remove_hook(hook)
+    return result, [sql for sql in executed if sql.startswith("UPDATE")]
+
+
+class FakeVar:
+    # Stands in for tk.Entry / tk.StringVar (no display in tests)
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+
+class FakePopup:
+    def destroy(self):
+        pass
+
+
+def submit_form(controller, id, entries):
+    """Runs the form's real submit path: handle_submit → controller.update."""
+    results = []
+    handle_submit(entries, lambda data: results.append(submitted_updates(controller, id, data)), FakePopup())
+    return results[0]
+
+
+def user_form(record, **changes):
+    # What open_form_popup builds for a user, pre-filled from the stored record
+    values = {
+        "customId": record.customId, "username": record.username, "email": record.email,
+        "account_status": record.account_status, "is_locked": str(record.is_locked),
+        "access_level_name": record.access_level_name, **changes,
+    }
+    entries = {field: FakeVar(value) for field, value in values.items()}
+    for dropdown in ("account_status", "is_locked"):
+        entries[dropdown] = (entries[dropdown], None)  # plain options → no label map
+    return entries
+
+
+def test_users_update_from_submitted_form_writes_only_changes(app_db):
+    record = UsersController.edit(2)
+    assert submit_form(UsersController, record.id, user_form(record)) == (False, [])
+
+    assert submit_form(UsersController, record.id, user_form(record, email="jean@example.com")) == (
+        True, ["UPDATE users SET email=?, updated_at=? WHERE id = ?"]
+    )
+    user = User.edit(2)
+    assert (user.email, user.account_status, user.is_locked) == ("jean@example.com", "active", 0)
+
+
+def test_dropdown_labels_map_back_to_values(app_db):
+    entries = {"access_level": (FakeVar("Staff"), {"Admin": 1, "Staff": 2}), "email": None}
+    submitted = []
+    handle_submit(entries, submitted.append, FakePopup())
+    assert submitted == [{"access_level": 2, "email": None}]
+
+    # None (an input without a value) never clears a loaded column
+    assert submitted_updates(UsersController, 2, submitted[0]) == (
+        True, ["UPDATE users SET access_level=?, updated_at=? WHERE id = ?"]
+    )
+    assert User.edit(2).email == "admin@admin.com"
+
+
+def test_settings_form_prefilled_from_stored_record(app_db):
+    record = SettingsController.edit(2)
+    assert record.setting_name == "window_size"  # raw, not the capitalized display value
+
+    entries = {"setting_name": FakeVar(record.setting_name), "setting_value": FakeVar(record.setting_value)}
+    assert submit_form(SettingsController, record.id, entries) == (False, [])
+
+    entries["setting_value"] = FakeVar("1280x800")
+    assert submit_form(SettingsController, record.id, entries) == (
+        True, ["UPDATE settings SET setting_value=?, updated_at=? WHERE id = ?"]
+    )
+    assert Setting.edit(2).setting_value == "1280x800"
+
+
+def test_service_async_store_and_delete(app_db):
+    service = UsersService()
+
+    async def round_trip():
+        stored = await service.astore({"username": "async_user", "email": "async@example.com"})
+        found = await service.aedit(stored.id)
+        deleted = await service.adelete(stored.id)
+        return stored, found, deleted
+
+    try:
+        stored, found, deleted = asyncio.run(round_trip())
+    finally:
+        BaseModel.shutdown_async()
+
+    assert found.username == "async_user" and deleted is True
+    assert User.edit(stored.id) is None
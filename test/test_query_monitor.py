@@ -0,0 +1,54 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.query_monitor import QueryMonitor
+from models.base_model import BaseModel
+from controllers.UsersController import UsersController
+from test.conftest import Item
+
+
+def test_fingerprint_normalizes_literals_and_in_lists():
+    a = QueryMonitor.fingerprint("SELECT * FROM t  WHERE id IN (?, ?, ?) AND name = 'bob' LIMIT 10")
+    b = QueryMonitor.fingerprint("SELECT * FROM t WHERE id IN (?, ?) AND name = 'x''y' LIMIT 5")
+    assert a == b == "SELECT * FROM t WHERE id IN (?, ...) AND name = ? LIMIT ?"
+
+
+def test_hook_receives_every_model_statement(empty_items_db):
+    db_path = empty_items_db
+    events = []
+    hook = QueryMonitor.add_hook(events.append)
+    try:
+        Item.store_many_sqlite(db_path, "items", [{"name": "a"}, {"name": "b"}])
+        Item.update_sqlite(db_path, "items", 1, name="c")
+        BaseModel.clear_result_cache()
+        Item.index_sqlite(db_path, "items", Item.fields, pagination=True, items_per_page=1)
+        list(Item.iter_sqlite(db_path, "items", Item.fields))
+    finally:
+        QueryMonitor.remove_hook(hook)
+
+    kinds = [event["fingerprint"].split()[0] for event in events]
+    assert kinds == ["INSERT", "UPDATE", "SELECT", "SELECT"]
+    assert events[0]["rows"] == 2
+    assert events[2]["param_count"] == 2 and events[2]["rows"] == 1
+    assert events[3]["rows"] == 2
+    assert all(event["duration_ms"] >= 0 and event["controller"] is None for event in events)
+
+
+def test_controller_is_recorded_and_slow_queries_logged(tmp_path):
+    log_path = str(tmp_path / "slow.log")
+    events = []
+    hook = QueryMonitor.add_hook(events.append)
+    previous = (QueryMonitor.slow_query_ms, QueryMonitor.log_path)
+    QueryMonitor.configure(slow_query_ms=0, log_path=log_path)
+    try:
+        BaseModel.clear_result_cache()
+        UsersController.index(filters={"username": "admin"})
+    finally:
+        QueryMonitor.remove_hook(hook)
+        QueryMonitor.configure(slow_query_ms=previous[0], log_path=previous[1])
+
+    assert events and events[0]["controller"] == "UsersController.index"
+    with open(log_path, encoding="utf-8") as log:
+        assert "controller=UsersController.index" in log.read()
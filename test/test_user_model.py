@@ -4,7 +4,7 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from models.user import User  # only once
-from requests.UserRequest import UserRequest
+from request_objects.UserRequest import UserRequest
 def test_index():
 
 
@@ -25,7 +25,7 @@ def test_index():
     # return
     # # Combination: filter and pagination
     # print("Filtered by username='jean' with pagination (page 1)")
-    filtered_paginated = User.index(filters={"id": 1}, pagination=True, items_per_page=5, page=1)
+    filtered_paginated = User.index(filters={"id__eq": 1}, pagination=True, items_per_page=5, page=1)
     print(filtered_paginated)
     return
 
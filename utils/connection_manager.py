@@ -0,0 +1,388 @@
+# utils/connection_manager.py
+import atexit
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+
+class ConnectionManager:
+    """
+    Shared SQLite connection pool, one manager per database file.
+
+    Models borrow a connection with ``connection()`` and hand it back when
+    the block ends. Idle connections are kept (up to ``pool_size``) and
+    reused by the next call instead of paying for a fresh ``sqlite3.connect``.
+
+    Every new connection gets the PRAGMAs of the active performance profile
+    (see PROFILES / resolve_profile()).
+
+    Threads marked with pin_thread() (e.g. async worker threads) skip the
+    pool: each keeps one dedicated connection per database for its lifetime.
+
+    Usage:
+        with ConnectionManager.get(db_path).connection() as conn:
+            conn.execute("SELECT 1")
+    """
+
+    _managers = {}
+    _registry_lock = threading.Lock()
+
+    # Thread-pinned connections: thread-local {manager: [conn, depth]}
+    _local = threading.local()
+
+    # Defaults for every manager (see configure())
+    pool_size = 5          # max idle connections kept per database
+    reuse = True           # False → connect/close per call (old behaviour)
+    timeout = 5.0          # sqlite busy timeout in seconds
+    cached_statements = 256  # per-connection prepared statement cache
+
+    # Named PRAGMA sets applied to every new connection.
+    # journal_mode is stored in the database file, so leaving "performance"
+    # keeps WAL until it is changed explicitly.
+    PROFILES = {
+        "default": {},
+        "performance": {
+            "journal_mode": "WAL",        # readers no longer block the writer
+            "synchronous": "NORMAL",      # fsync at checkpoints only (safe with WAL)
+            "cache_size": -32000,         # negative → KiB, ~32 MB page cache
+            "mmap_size": 268435456,       # 256 MB memory-mapped reads
+            "temp_store": "MEMORY",       # temp b-trees (ORDER BY, DISTINCT) in RAM
+        },
+    }
+    profile = None              # None → $DB_PROFILE, then settings.db_profile, then "default"
+    PROFILE_ENV = "DB_PROFILE"
+    PROFILE_SETTING = "db_profile"
+
+    def __init__(self, db_path, pool_size=None, reuse=None, timeout=None, profile=None):
+        self.db_path = db_path
+        self.pool_size = ConnectionManager.pool_size if pool_size is None else pool_size
+        self.reuse = ConnectionManager.reuse if reuse is None else reuse
+        self.timeout = ConnectionManager.timeout if timeout is None else timeout
+        self.profile = ConnectionManager.profile if profile is None else profile
+        self._profile_name = None   # resolved on first connect
+
+        self._idle = []
+        self._pinned = set()        # dedicated connections of pinned threads
+        self._lock = threading.Lock()
+        self._stats = {
+            "opened": 0,
+            "closed": 0,
+            "reused": 0,
+            "in_use": 0,
+            "open_seconds": 0.0,
+            "close_seconds": 0.0,
+        }
+
+    # -----------------------
+    # Registry
+    # -----------------------
+    @classmethod
+    def get(cls, db_path):
+        """Returns the shared manager for db_path (created on first use)."""
+        key = os.path.abspath(db_path)
+        with cls._registry_lock:
+            manager = cls._managers.get(key)
+            if manager is None:
+                manager = cls(key)
+                cls._managers[key] = manager
+            return manager
+
+    @classmethod
+    def configure(cls, pool_size=None, reuse=None, timeout=None, profile=None):
+        """Changes the defaults and applies them to managers already created."""
+        if pool_size is not None:
+            cls.pool_size = pool_size
+        if reuse is not None:
+            cls.reuse = reuse
+        if timeout is not None:
+            cls.timeout = timeout
+        if profile is not None:
+            cls.profile_pragmas(profile)  # validate the name
+            cls.profile = profile
+
+        with cls._registry_lock:
+            managers = list(cls._managers.values())
+
+        for manager in managers:
+            manager.pool_size = cls.pool_size
+            manager.reuse = cls.reuse
+            manager.timeout = cls.timeout
+            if profile is not None and manager.profile != profile:
+                # Idle connections carry the old PRAGMAs → reopen lazily
+                manager.profile = profile
+                manager._profile_name = None
+                manager.close()
+            manager._trim()
+
+    @classmethod
+    def close_all(cls):
+        """Closes every idle and thread-pinned connection of every manager (clean shutdown)."""
+        with cls._registry_lock:
+            managers = list(cls._managers.values())
+        for manager in managers:
+            manager.close(include_pinned=True)
+
+    @classmethod
+    def all_stats(cls):
+        with cls._registry_lock:
+            managers = list(cls._managers.items())
+        return {path: manager.stats() for path, manager in managers}
+
+    # -----------------------
+    # Performance profile
+    # -----------------------
+    @classmethod
+    def profile_pragmas(cls, name):
+        if name not in cls.PROFILES:
+            raise ValueError(f"Unknown database profile: {name}")
+        return cls.PROFILES[name]
+
+    @classmethod
+    def resolve_profile(cls, conn, profile=None):
+        """
+        Profile name for conn: explicit profile, else the DB_PROFILE environment
+        variable, else the `db_profile` row of the settings table, else "default".
+        Unknown names from the environment / settings fall back to "default".
+        """
+        if profile:
+            return profile
+
+        name = os.environ.get(cls.PROFILE_ENV)
+        if not name:
+            try:
+                row = conn.execute(
+                    "SELECT setting_value FROM settings WHERE setting_name = ? LIMIT 1",
+                    (cls.PROFILE_SETTING,),
+                ).fetchone()
+                name = row[0] if row else None
+            except sqlite3.Error:
+                name = None  # no settings table yet (fresh database / migrations)
+
+        name = (name or "").strip().lower()
+        return name if name in cls.PROFILES else "default"
+
+    @classmethod
+    def apply_profile(cls, conn, name):
+        for pragma, value in cls.profile_pragmas(name).items():
+            conn.execute(f"PRAGMA {pragma} = {value}").fetchall()
+
+    @classmethod
+    def connect(cls, db_path, profile=None, timeout=None):
+        """
+        Unpooled connection with the active profile applied (for migrations and
+        scripts that manage their own connection).
+        """
+        conn = sqlite3.connect(db_path, timeout=cls.timeout if timeout is None else timeout)
+        cls.apply_profile(conn, cls.resolve_profile(conn, profile or cls.profile))
+        return conn
+
+    # -----------------------
+    # Open / close
+    # -----------------------
+    def _open(self):
+        start = time.perf_counter()
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.timeout,
+            check_same_thread=False,
+            cached_statements=self.cached_statements,
+        )
+        try:
+            if self._profile_name is None:
+                self._profile_name = self.resolve_profile(conn, self.profile)
+            self.apply_profile(conn, self._profile_name)
+        except Exception:
+            conn.close()
+            raise
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            self._stats["opened"] += 1
+            self._stats["open_seconds"] += elapsed
+        return conn
+
+    def _close(self, conn):
+        start = time.perf_counter()
+        try:
+            conn.close()
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._stats["closed"] += 1
+                self._stats["close_seconds"] += elapsed
+
+    def _trim(self):
+        with self._lock:
+            keep = self.pool_size if self.reuse else 0
+            extra = self._idle[keep:]
+            del self._idle[keep:]
+        for conn in extra:
+            self._close(conn)
+
+    # -----------------------
+    # Thread pinning
+    # -----------------------
+    @classmethod
+    def pin_thread(cls):
+        """
+        From now on the calling thread gets its own connection per database
+        (opened on first use, kept until unpin_thread() / close_all()).
+        Usable as a ThreadPoolExecutor initializer.
+        """
+        if getattr(cls._local, "pinned", None) is None:
+            cls._local.pinned = {}
+
+    @classmethod
+    def unpin_thread(cls):
+        """Closes the calling thread's dedicated connections and returns it to the pool."""
+        pinned = getattr(cls._local, "pinned", None) or {}
+        cls._local.pinned = None
+        for manager, (conn, _) in pinned.items():
+            with manager._lock:
+                manager._pinned.discard(conn)
+            manager._close(conn)
+
+    @classmethod
+    def is_thread_pinned(cls):
+        return getattr(cls._local, "pinned", None) is not None
+
+    def _pinned_entry(self):
+        pinned = getattr(ConnectionManager._local, "pinned", None)
+        if pinned is None:
+            return None
+        entry = pinned.get(self)
+        if entry is None or entry[0] not in self._pinned:
+            # First use on this thread (or closed by close()) → open a dedicated connection
+            conn = self._open()
+            with self._lock:
+                self._pinned.add(conn)
+            entry = pinned[self] = [conn, 0]
+        return entry
+
+    # -----------------------
+    # Borrow / return
+    # -----------------------
+    def acquire(self):
+        entry = self._pinned_entry()
+        if entry is not None:
+            entry[1] += 1
+            with self._lock:
+                self._stats["in_use"] += 1
+            return entry[0]
+
+        conn = None
+        with self._lock:
+            if self.reuse and self._idle:
+                conn = self._idle.pop()
+                self._stats["reused"] += 1
+            self._stats["in_use"] += 1
+
+        if conn is None:
+            try:
+                conn = self._open()
+            except Exception:
+                with self._lock:
+                    self._stats["in_use"] -= 1
+                raise
+        return conn
+
+    def release(self, conn, discard=False):
+        pinned = getattr(ConnectionManager._local, "pinned", None)
+        entry = pinned.get(self) if pinned else None
+        if entry is not None and entry[0] is conn:
+            self._release_pinned(pinned, entry, discard)
+            return
+
+        # Never hand a half-finished transaction to the next caller
+        if not discard and conn.in_transaction:
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                discard = True
+
+        with self._lock:
+            self._stats["in_use"] -= 1
+            if not discard and self.reuse and len(self._idle) < self.pool_size:
+                self._idle.append(conn)
+                return
+
+        self._close(conn)
+
+    def _release_pinned(self, pinned, entry, discard):
+        conn = entry[0]
+        entry[1] -= 1
+        if not discard and entry[1] == 0 and conn.in_transaction:
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                discard = True
+
+        with self._lock:
+            self._stats["in_use"] -= 1
+            if discard:
+                self._pinned.discard(conn)
+        if discard:
+            del pinned[self]
+            self._close(conn)
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        try:
+            yield conn
+        except sqlite3.DatabaseError:
+            # The handle may be unusable (corrupt / closed) → don't pool it
+            self.release(conn, discard=True)
+            raise
+        except BaseException:
+            self.release(conn)
+            raise
+        else:
+            self.release(conn)
+
+    def close(self, include_pinned=False):
+        with self._lock:
+            idle = self._idle
+            self._idle = []
+            if include_pinned:
+                # Owning threads reopen lazily on their next acquire()
+                idle += list(self._pinned)
+                self._pinned.clear()
+        for conn in idle:
+            self._close(conn)
+
+    # -----------------------
+    # Instrumentation
+    # -----------------------
+    def stats(self):
+        """
+        Returns pool counters:
+            opened / closed / reused / in_use / idle / pinned
+            profile: PRAGMA profile applied to new connections (None before the first)
+            open_seconds, close_seconds: total time spent connecting/closing
+            avg_open_ms: average sqlite3.connect() latency
+            saved_seconds: estimated time saved by reuse (reused * avg open)
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["idle"] = len(self._idle)
+            stats["pinned"] = len(self._pinned)
+            stats["profile"] = self._profile_name
+
+        avg_open = stats["open_seconds"] / stats["opened"] if stats["opened"] else 0.0
+        stats["avg_open_ms"] = avg_open * 1000
+        stats["saved_seconds"] = stats["reused"] * (
+            avg_open + (stats["close_seconds"] / stats["closed"] if stats["closed"] else 0.0)
+        )
+        return stats
+
+    def reset_stats(self):
+        with self._lock:
+            for key in self._stats:
+                if key != "in_use":
+                    self._stats[key] = 0 if isinstance(self._stats[key], int) else 0.0
+
+
+atexit.register(ConnectionManager.close_all)
@@ -124,16 +124,24 @@ def handle_submit(entries, on_submit, popup):
     """
     Collects all values from the form and calls the on_submit callback.
     """
-    data = {}
-    for field, widget in entries.items():
-        if isinstance(widget, tk.Entry):
-            data[field] = widget.get()
-        elif isinstance(widget, tk.StringVar):
-            data[field] = widget.get()
-        else:
-            data[field] = None
+    data = {field: get_field_value(widget) for field, widget in entries.items()}
 
     if callable(on_submit):
         on_submit(data)
 
     popup.destroy()
+
+
+def get_field_value(widget):
+    """
+    Submitted value of one input: the Entry / StringVar text, or for a dropdown
+    ((StringVar, label_to_value) from create_dropdown_field) the option value
+    behind the selected label.
+    """
+    if isinstance(widget, tuple):
+        var, label_to_value = widget
+        label = var.get()
+        return label_to_value.get(label, label) if label_to_value else label
+    if hasattr(widget, "get"):
+        return widget.get()
+    return None
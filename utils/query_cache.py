@@ -0,0 +1,120 @@
+# utils/query_cache.py
+import sys
+import threading
+from collections import OrderedDict
+
+
+class QueryCache:
+    """
+    LRU cache for query results, bounded by entry count and (estimated) memory.
+
+    Every entry remembers which tables it read and their write versions at
+    read time. invalidate(table) drops the entries that read that table, and
+    get() also rejects an entry whose versions no longer match.
+    """
+
+    def __init__(self, max_entries=256, max_bytes=8 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._entries = OrderedDict()   # key → (value, tables, versions, size)
+        self._by_table = {}             # table → set(keys)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    # -----------------------
+    # Lookup / store
+    # -----------------------
+    def get(self, key, versions):
+        """Returns the cached value, or None on a miss / stale entry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[2] != versions:
+                if entry is not None:
+                    self._remove(key)
+                self._stats["misses"] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[0]
+
+    def set(self, key, value, tables, versions, size=None):
+        size = self.estimate_size(value) if size is None else size
+        if size > self.max_bytes:
+            return  # larger than the whole cache → not worth keeping
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (value, tuple(tables), versions, size)
+            self._bytes += size
+            for table in tables:
+                self._by_table.setdefault(table, set()).add(key)
+
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._stats["evictions"] += 1
+
+    # -----------------------
+    # Invalidation
+    # -----------------------
+    def invalidate(self, table):
+        """Drops every entry that read table."""
+        with self._lock:
+            keys = self._by_table.pop(table, ())
+            for key in list(keys):
+                if key in self._entries:
+                    self._remove(key)
+                    self._stats["invalidations"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_table.clear()
+            self._bytes = 0
+
+    def _remove(self, key):
+        _, tables, _, size = self._entries.pop(key)
+        self._bytes -= size
+        for table in tables:
+            keys = self._by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_table[table]
+
+    # -----------------------
+    # Instrumentation
+    # -----------------------
+    def stats(self):
+        """hits / misses / hit_ratio / entries / bytes / evictions / invalidations"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["bytes"] = self._bytes
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    def reset_stats(self):
+        with self._lock:
+            for key in self._stats:
+                self._stats[key] = 0
+
+    @staticmethod
+    def estimate_size(value):
+        """Rough deep size of nested tuples/lists/dicts of scalars."""
+        size = sys.getsizeof(value)
+        if isinstance(value, dict):
+            for key, item in value.items():
+                size += QueryCache.estimate_size(key) + QueryCache.estimate_size(item)
+        elif isinstance(value, (list, tuple)):
+            for item in value:
+                size += QueryCache.estimate_size(item)
+        return size
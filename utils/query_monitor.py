@@ -0,0 +1,187 @@
+# utils/query_monitor.py
+import hashlib
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from logging.handlers import RotatingFileHandler
+
+LOG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "logs")
+
+
+class QueryMonitor:
+    """
+    Timing hook around every statement the models execute.
+
+    Each statement produces an event dict:
+        fingerprint: SQL with literals → ?, IN lists collapsed, whitespace squashed
+        digest:      short hash of the fingerprint (stable id for grouping)
+        sql, param_count, duration_ms, rows (fetched, or rowcount for writes)
+        controller:  calling controller method, e.g. "UsersController.index"
+
+    Events go to every registered hook, and statements slower than
+    slow_query_ms are written to a rotating log file.
+
+    Usage:
+        QueryMonitor.add_hook(lambda event: print(event["digest"], event["duration_ms"]))
+        QueryMonitor.configure(slow_query_ms=100)
+    """
+
+    hooks = []
+    slow_query_ms = 250.0          # None → no slow-query log
+    log_path = os.path.join(LOG_DIR, "slow_queries.log")
+    log_max_bytes = 1024 * 1024
+    log_backup_count = 5
+
+    _logger = None
+    _lock = threading.Lock()
+    _local = threading.local()      # controller bound to a worker thread (async API)
+
+    # -----------------------
+    # Configuration
+    # -----------------------
+    @classmethod
+    def configure(cls, slow_query_ms=..., log_path=None, log_max_bytes=None, log_backup_count=None):
+        """Changes the threshold / log file (pass slow_query_ms=None to disable the log)."""
+        if slow_query_ms is not ...:
+            cls.slow_query_ms = slow_query_ms
+        if log_path is not None:
+            cls.log_path = log_path
+        if log_max_bytes is not None:
+            cls.log_max_bytes = log_max_bytes
+        if log_backup_count is not None:
+            cls.log_backup_count = log_backup_count
+
+        with cls._lock:
+            if cls._logger is not None:
+                # Reopen with the new file / rotation settings on next slow query
+                for handler in list(cls._logger.handlers):
+                    cls._logger.removeHandler(handler)
+                    handler.close()
+                cls._logger = None
+
+    @classmethod
+    def add_hook(cls, hook):
+        """hook(event) is called after every statement; exceptions in hooks are logged, not raised."""
+        if hook not in cls.hooks:
+            cls.hooks.append(hook)
+        return hook
+
+    @classmethod
+    def remove_hook(cls, hook):
+        if hook in cls.hooks:
+            cls.hooks.remove(hook)
+
+    # -----------------------
+    # Recording
+    # -----------------------
+    @classmethod
+    @contextmanager
+    def track(cls, sql, params=None):
+        """
+        Times the block; set event["rows"] inside it.
+
+            with QueryMonitor.track(sql, params) as event:
+                rows = conn.execute(sql, params).fetchall()
+                event["rows"] = len(rows)
+        """
+        event = {"rows": None}
+        start = time.perf_counter()
+        try:
+            yield event
+        finally:
+            cls.record(sql, params, time.perf_counter() - start, event["rows"])
+
+    @classmethod
+    def record(cls, sql, params, seconds, rows=None):
+        duration_ms = seconds * 1000
+        slow = cls.slow_query_ms is not None and duration_ms >= cls.slow_query_ms
+        if not cls.hooks and not slow:
+            return  # nothing listens → skip building the event
+
+        fingerprint = cls.fingerprint(sql)
+        event = {
+            "fingerprint": fingerprint,
+            "digest": cls.digest(fingerprint),
+            "sql": sql,
+            "param_count": len(params) if params is not None else 0,
+            "duration_ms": duration_ms,
+            "rows": rows,
+            "controller": cls.caller(),
+        }
+
+        for hook in list(cls.hooks):
+            try:
+                hook(event)
+            except Exception:
+                cls._get_logger().exception("query hook %r failed", hook)
+
+        if slow:
+            cls._get_logger().warning(
+                "slow query %.1f ms [%s] controller=%s params=%d rows=%s :: %s",
+                duration_ms, event["digest"], event["controller"], event["param_count"],
+                rows, fingerprint,
+            )
+
+    # -----------------------
+    # Helpers
+    # -----------------------
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def fingerprint(sql):
+        text = re.sub(r"'(?:[^']|'')*'", "?", sql)
+        text = re.sub(r"\b\d+(?:\.\d+)?\b", "?", text)
+        text = re.sub(r"\(\s*\?(?:\s*,\s*\?)+\s*\)", "(?, ...)", text)
+        return " ".join(text.split())
+
+    @staticmethod
+    def digest(fingerprint):
+        return hashlib.sha1(fingerprint.encode("utf-8")).hexdigest()[:12]
+
+    @classmethod
+    @contextmanager
+    def bind_controller(cls, controller):
+        """Reports controller for statements run by this thread inside the block."""
+        previous = getattr(cls._local, "controller", None)
+        cls._local.controller = controller
+        try:
+            yield
+        finally:
+            cls._local.controller = previous
+
+    @classmethod
+    def caller(cls):
+        """Nearest controller method on the stack ("UsersController.index"), or None."""
+        bound = getattr(cls._local, "controller", None)
+        if bound:
+            return bound
+
+        frame = sys._getframe(1)
+        while frame is not None:
+            module = frame.f_globals.get("__name__", "")
+            if module.startswith("controllers."):
+                code = frame.f_code
+                return getattr(code, "co_qualname", code.co_name)
+            frame = frame.f_back
+        return None
+
+    @classmethod
+    def _get_logger(cls):
+        with cls._lock:
+            if cls._logger is None:
+                logger = logging.getLogger("landowner.slow_queries")
+                logger.setLevel(logging.INFO)
+                logger.propagate = False
+                os.makedirs(os.path.dirname(os.path.abspath(cls.log_path)), exist_ok=True)
+                handler = RotatingFileHandler(
+                    cls.log_path, maxBytes=cls.log_max_bytes,
+                    backupCount=cls.log_backup_count, encoding="utf-8", delay=True,
+                )
+                handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+                logger.addHandler(handler)
+                cls._logger = logger
+            return cls._logger
@@ -1,7 +1,8 @@
 # main_window.py
 import tkinter as tk
+from models.base_model import BaseModel
 from models.navigation import Navigation
-from models.Setting import Setting
+from models.setting import Setting
 from views.right_panel import RightPanel
 
 
@@ -10,7 +11,7 @@ class MainWindow:
         self.root = tk.Tk()
         self.root.title("LandOwner - Main Window")
 
-        WindowSize = Setting.index(filters={"setting_name": "window_size"})
+        WindowSize = Setting.index(filters={"setting_name__eq": "window_size"})
         self.root.geometry(WindowSize[0].setting_value if WindowSize else "800x600")
 
         self.root.grid_rowconfigure(0, weight=1)
@@ -41,6 +42,9 @@ class MainWindow:
 
         self.root.mainloop()
 
+        # Window closed → release pooled DB connections
+        BaseModel.close_connections()
+
     # --------------------------------------------------
     # Navigation Loader
     # --------------------------------------------------
@@ -41,7 +41,8 @@ class RightPanel(tk.Frame):
 
             # Fetch initial result (page 1)
             initial_result = controller_class.index(
-                filters={}, pagination=True, items_per_page=10, page=1
+                filters={}, pagination=True, items_per_page=10, page=1,
+                pagination_mode="keyset",
             )
 
             if initial_result:
@@ -68,15 +69,13 @@ class RightPanel(tk.Frame):
                 columns = [field for field, _ in visible_fields]
                 column_labels = [alias for _, alias in visible_fields]
 
-                # Convert objects → dicts
-                data = [obj.__dict__ for obj in data_list]
-
-                # Create Table
+                # Create Table (the ResultSet is handed over as-is; rows are
+                # only turned into objects when one is selected / edited)
                 table = TableView(
                     self,
                     columns=columns,
                     column_labels=column_labels,
-                    data=data,
+                    data=data_list,
                     controller_callback=None,  # Added later
                     title=navigation_name,
                 )
@@ -92,20 +91,28 @@ class RightPanel(tk.Frame):
                     pagination=False,
                     items_per_page=10,
                     page=1,
+                    cursor=None,
+                    order_by=None,
                     **kwargs
                 ):
                     try:
+                        # Keyset mode: Previous/Next seek from a cursor instead of OFFSET
                         result = controller_class.index(
                             filters=filters,
                             pagination=True,
                             items_per_page=10,
                             page=page,
                             searchAll=searchAll,
+                            pagination_mode="keyset",
+                            cursor=cursor,
+                            order_by=order_by,
                         )
 
                         table.total_rows = result.get("total_rows", 0)
                         table.total_pages = result.get("total_pages", 1)
                         table.last_page = result.get("last_page", 1)
+                        table.next_cursor = result.get("next_cursor")
+                        table.prev_cursor = result.get("prev_cursor")
 
                         
                         return result["data"]
@@ -115,6 +122,8 @@ class RightPanel(tk.Frame):
                         table.total_rows = 0
                         table.total_pages = 1
                         table.last_page = 1
+                        table.next_cursor = None
+                        table.prev_cursor = None
                         return []
 
                 table.controller_callback = controller_callback
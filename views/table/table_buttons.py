@@ -34,8 +34,9 @@ def on_edit(table_view: "TableView"):
     item_index = table_view.tree.index(item_id)
     row = table_view.filtered_data[item_index]
 
-    # Now pass the full row object to your controller
-    table_view.trigger_controller_method("edit", data=row)
+    # Pre-fill from the stored record: the table row holds display values
+    # ("Active", "Enabled") that would be written back as changes
+    record = table_view.trigger_controller_method("edit", data=row.id) or row
 
 
     field_definitions = table_view.trigger_controller_method("create")  # reuse field metadata
@@ -53,7 +54,7 @@ def on_edit(table_view: "TableView"):
         table_view.filtered_data = table_view.original_data.copy()
         table_view.render_rows()
 
-    open_form_popup("Update Data", field_definitions, on_submit=on_submit, initial_data=row)
+    open_form_popup("Update Data", field_definitions, on_submit=on_submit, initial_data=record)
 
 
 def on_delete(table_view):
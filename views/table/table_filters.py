@@ -64,22 +64,22 @@ def apply_advanced_filters(self):
         if self.date_created_enabled.get():
             d = self.date_created_entry.get().strip()
             if d:
-                filters["created_at_from"] = d
-                filters["created_at_to"] = parse_date_plus(d)
+                filters["created_at__gte"] = d
+                filters["created_at__lt"] = parse_date_plus(d)
 
         if self.date_updated_enabled.get():
             d = self.date_updated_entry.get().strip()
             if d:
-                filters["updated_at_from"] = d
-                filters["updated_at_to"] = parse_date_plus(d)
+                filters["updated_at__gte"] = d
+                filters["updated_at__lt"] = parse_date_plus(d)
 
         if self.enable_range_var.get():
             d_from = self.created_at_from.get().strip()
             d_to = self.created_at_to.get().strip()
             if d_from:
-                filters["created_at_from"] = d_from
+                filters["created_at__gte"] = d_from
             if d_to:
-                filters["created_at_to"] = parse_date_plus(d_to)
+                filters["created_at__lt"] = parse_date_plus(d_to)
 
     if self.controller_callback:
         # self.filtered_data = self.controller_callback(filters=filters)
@@ -91,13 +91,7 @@ def apply_advanced_filters(self):
             if all(
                 str(row.get(col, "")).lower().find(val) != -1
                 for col, val in filters.items()
-                if col
-                not in {
-                    "created_at_from",
-                    "created_at_to",
-                    "updated_at_from",
-                    "updated_at_to",
-                }
+                if "__" not in col  # typed date-range operators only apply server-side
             )
         ]
 
@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import ttk
 from tkinter import messagebox
+from models.result_set import ResultSet
 from views.table.table_filters import create_filter_window, apply_advanced_filters
 from views.table.treeview_styles import apply_treeview_style
 from views.table.table_buttons import on_add, on_edit, on_delete
@@ -17,6 +18,9 @@ class TableView(tk.Frame):
         self.items_per_page = 10
         self.total_rows = 0
         self.total_pages = 1
+        self.next_cursor = None   # keyset cursors set by controller_callback
+        self.prev_cursor = None
+        self.order_by = None      # "column" / "-column", set by clicking a heading
         
         if columns is None:
             if (
@@ -115,7 +119,7 @@ class TableView(tk.Frame):
         #Loop Columns
         for col, label in zip(self.columns, self.column_labels):
             
-            self.tree.heading(col, text=label)
+            self.tree.heading(col, text=label, command=lambda c=col: self.sort_by(c))
             if col.lower() == "id":
                 self.tree.column(col, width=50, anchor="center", stretch=False)
             elif col.lower() == "customid":
@@ -189,7 +193,7 @@ class TableView(tk.Frame):
     def configure_styles(self, config):
         apply_treeview_style(config)
 
-    def render_rows(self):
+    def render_rows(self, cursor=None):
         if self.controller_callback:
 
             window_open = (
@@ -201,23 +205,36 @@ class TableView(tk.Frame):
                 rows = self.controller_callback(
                     filters=self.advance_filter,
                     page=self.current_page,
+                    cursor=cursor,
+                    order_by=self.order_by,
                 )
             else:
                 rows = self.controller_callback(
                     searchAll=self.search_entry.get().strip().lower(),
                     page=self.current_page,
+                    cursor=cursor,
+                    order_by=self.order_by,
                 )
 
             # ✅ rows ONLY — pagination already set by controller_callback
             self.filtered_data = rows or []
 
+            # A keyset cursor carries its own page number
+            if cursor:
+                self.current_page = getattr(self, "last_page", self.current_page)
+
         # -----------------------
         # Render table rows
         # -----------------------
         self.tree.delete(*self.tree.get_children())
 
-        for idx, row in enumerate(self.filtered_data):
-            values = [getattr(row, col, "") for col in self.columns]
+        if isinstance(self.filtered_data, ResultSet):
+            # Straight from the raw tuples → no model objects built
+            row_values = self.filtered_data.values(self.columns)
+        else:
+            row_values = [[getattr(row, col, "") for col in self.columns] for row in self.filtered_data]
+
+        for idx, values in enumerate(row_values):
             tag = "evenrow" if idx % 2 == 0 else "oddrow"
             self.tree.insert("", tk.END, values=values, tags=(tag,))
 
@@ -237,12 +254,16 @@ class TableView(tk.Frame):
 
 
     def load_previous_page(self):
-        if self.current_page > 1:
+        if self.prev_cursor:
+            self.render_rows(cursor=self.prev_cursor)
+        elif self.current_page > 1:
             self.current_page -= 1
             self.render_rows()
 
     def load_next_page(self):
-        if hasattr(self, "total_pages") and self.current_page < self.total_pages:
+        if self.next_cursor:
+            self.render_rows(cursor=self.next_cursor)
+        elif hasattr(self, "total_pages") and self.current_page < self.total_pages:
             self.current_page += 1
             self.render_rows()
 
@@ -286,6 +307,27 @@ class TableView(tk.Frame):
     #         self.trigger_controller_method("destroy", id=row_id)
     #         self.render_rows()
 
+    def sort_by(self, column):
+        """Heading click: sort by column; clicking it again flips the direction (server-side via controller_callback)."""
+        self.order_by = f"-{column}" if self.order_by == column else column
+        descending = self.order_by.startswith("-")
+
+        for col, label in zip(self.columns, self.column_labels):
+            arrow = (" ▼" if descending else " ▲") if col == column else ""
+            self.tree.heading(col, text=f"{label}{arrow}")
+
+        # A new order invalidates the page position and any keyset cursors
+        self.current_page = 1
+        self.next_cursor = self.prev_cursor = None
+
+        if not self.controller_callback:
+            self.filtered_data = sorted(
+                self.filtered_data,
+                key=lambda row: (getattr(row, column, None) is None, str(getattr(row, column, "")).lower()),
+                reverse=descending,
+            )
+        self.render_rows()
+
     def on_search(self, event=None):
         self.current_page = 1
         self.render_rows()